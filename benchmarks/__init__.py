@@ -0,0 +1,13 @@
+"""
+Offline end-to-end ASR benchmarks for uWhisper.
+
+Run from the project root:
+    python -m benchmarks --corpus path/to/corpus [--save run.json] [--baseline baseline.json]
+"""
+import os
+import sys
+
+# The application modules live in src/ and import each other by bare name
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
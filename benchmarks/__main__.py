@@ -0,0 +1,59 @@
+import os
+import sys
+import json
+import argparse
+
+# Benchmarks run against models already in the cache only
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+from benchmarks.suite import run_all, compare, COMPARED_METRICS
+
+
+def print_table(run):
+    columns = ["files", "audio_s"] + COMPARED_METRICS
+    print(f"{'variant':<28}" + "".join(f"{c:>12}" for c in columns))
+    for name, metrics in run["results"].items():
+        if "error" in metrics:
+            print(f"{name:<28}  ERROR: {metrics['error']}")
+            continue
+        values = ["-" if metrics.get(c) is None else metrics[c] for c in columns]
+        print(f"{name:<28}" + "".join(f"{v:>12}" for v in values))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="uWhisper offline ASR benchmark")
+    parser.add_argument("--corpus", required=True, help="Directory of WAV/FLAC files (+ optional .txt references)")
+    parser.add_argument("--repeats", type=int, default=1, help="Decode each file this many times")
+    parser.add_argument("--only", nargs="*", help="Only run variants whose name contains one of these strings")
+    parser.add_argument("--save", metavar="JSON", help="Write the results to this file")
+    parser.add_argument("--baseline", metavar="JSON", help="Compare against a stored run and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown (default 10%%)")
+    args = parser.parse_args()
+
+    run = run_all(args.corpus, repeats=args.repeats, only=args.only)
+    if not run["results"]:
+        print("No downloaded models found; nothing to benchmark.")
+        return 1
+
+    print_table(run)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(run, f, indent=4)
+        print(f"Saved results to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(run, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+import os
+import glob
+import time
+import platform
+import resource
+import multiprocessing
+from queue import Empty
+import numpy as np
+
+from benchmarks.wer import wer
+
+AUDIO_EXTENSIONS = (".wav", ".flac")
+WHISPER_SIZES = ["tiny", "base", "small", "medium", "large-v3"]
+PARAKEET_VARIANTS = ["v2_en", "v3_multi"]
+
+# Lower is better for every compared metric
+COMPARED_METRICS = ["load_s", "p50_s", "p95_s", "p99_s", "rtf", "peak_rss_mb", "wer"]
+
+
+def load_corpus(corpus_dir):
+    """
+    Load every WAV/FLAC file in `corpus_dir`.
+
+    A reference transcript is read from a .txt file with the same base name, if present.
+    Returns a list of (name, audio, reference-or-None), sorted by name.
+    """
+    from tuner import load_clip
+
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*"))):
+        base, ext = os.path.splitext(path)
+        if ext.lower() not in AUDIO_EXTENSIONS:
+            continue
+        reference = None
+        if os.path.exists(base + ".txt"):
+            with open(base + ".txt", encoding="utf-8") as f:
+                reference = f.read().strip()
+        corpus.append((os.path.basename(path), load_clip(path), reference))
+    return corpus
+
+
+def configured_variants():
+    """Every backend/variant whose model files are already in the local cache."""
+    from tuner import whisper_installed
+    from asr_parakeet import ASRParakeet
+
+    variants = []
+    for size in WHISPER_SIZES:
+        if whisper_installed(size):
+            variants.append({"name": f"faster_whisper/{size}", "backend": "faster_whisper",
+                             "settings": {"model_size": size}})
+    for variant in PARAKEET_VARIANTS:
+        if ASRParakeet.is_installed(variant):
+            variants.append({"name": f"parakeet_tdt/{variant}", "backend": "parakeet_tdt",
+                             "settings": {"parakeet_variant": variant}})
+    return variants
+
+
+def _create_model(backend):
+    if backend == "faster_whisper":
+        from asr_whisper import ASRWhisper
+        return ASRWhisper()
+    from asr_parakeet import ASRParakeet
+    return ASRParakeet()
+
+
+def run_variant(variant, corpus_dir, repeats=1):
+    """Benchmark one variant in the current process and return its metrics."""
+    from tuner import override_settings
+
+    corpus = load_corpus(corpus_dir)
+    if not corpus:
+        raise ValueError(f"No {'/'.join(AUDIO_EXTENSIONS)} files in {corpus_dir}")
+
+    with override_settings(model_backend=variant["backend"], **variant["settings"]):
+        model = _create_model(variant["backend"])
+
+        start = time.monotonic()
+        model.load()
+        load_time = time.monotonic() - start
+        model.warmup()
+
+        latencies = []
+        pairs = []
+        decode_total = 0.0
+        for _, audio, reference in corpus:
+            for _ in range(repeats):
+                start = time.monotonic()
+                text = model.transcribe(audio)
+                elapsed = time.monotonic() - start
+                latencies.append(elapsed)
+                decode_total += elapsed
+            if reference is not None:
+                pairs.append((reference, text))
+
+    audio_seconds = sum(len(audio) for _, audio, _ in corpus) / 16000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    score = wer(pairs) # None when no reference has any words
+    return {
+        "files": len(corpus),
+        "audio_s": round(audio_seconds, 2),
+        "load_s": round(load_time, 3),
+        "p50_s": round(float(p50), 4),
+        "p95_s": round(float(p95), 4),
+        "p99_s": round(float(p99), 4),
+        "rtf": round(decode_total / (audio_seconds * repeats), 4),
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "wer": round(score, 4) if score is not None else None,
+    }
+
+
+def _child(variant, corpus_dir, repeats, results):
+    os.environ["HF_HUB_OFFLINE"] = "1" # Never touch the network
+    try:
+        results.put(run_variant(variant, corpus_dir, repeats))
+    except Exception as e:
+        results.put({"error": str(e)})
+
+
+def _collect(process, results):
+    """The child's result, or an error entry if it died (OOM kill, segfault) without reporting."""
+    while True:
+        try:
+            return results.get(timeout=1.0)
+        except Empty:
+            if not process.is_alive():
+                try:
+                    # A result put just before exiting may still be in the pipe
+                    return results.get(timeout=1.0)
+                except Empty:
+                    return {"error": f"exit code {process.exitcode}"}
+
+
+def run_all(corpus_dir, repeats=1, only=None):
+    """
+    Benchmark every configured variant, each in a fresh process so load time and
+    peak RSS are not skewed by previously loaded models.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for variant in configured_variants():
+        if only and not any(pattern in variant["name"] for pattern in only):
+            continue
+        print(f"Benchmarking {variant['name']}...", flush=True)
+        queue = ctx.Queue()
+        process = ctx.Process(target=_child, args=(variant, corpus_dir, repeats, queue))
+        process.start()
+        results[variant["name"]] = _collect(process, queue)
+        process.join()
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "host": platform.node(),
+            "cpu_count": os.cpu_count(),
+            "corpus": os.path.abspath(corpus_dir),
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.10):
+    """Return human-readable regressions of `current` against `baseline`."""
+    regressions = []
+    for name, metrics in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "error" in metrics or "error" in base:
+            continue
+        for metric in COMPARED_METRICS:
+            new, old = metrics.get(metric), base.get(metric)
+            if new is None or old is None:
+                continue
+            # WER gets an absolute slack so a single word on a tiny corpus doesn't trip it
+            limit = old + 0.01 if metric == "wer" else old * (1 + tolerance)
+            if new > limit:
+                regressions.append(f"{name}: {metric} {old} -> {new}")
+    return regressions
@@ -0,0 +1,113 @@
+"""
+Startup-time benchmark for the hotkey trigger (src/trigger.py).
+
+Runs the trigger repeatedly against a stand-in server socket and fails if its
+median overhead above a bare interpreter (`python -I -S -c pass`, timed in the
+same run so machine speed cancels out) exceeds the budget, or if the trigger
+imports anything beyond the builtin socket module and what a bare interpreter
+loads anyway.
+
+    python -m benchmarks.trigger_startup [--runs 30] [--budget-ms 10]
+"""
+import os
+import sys
+import socket
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+import time
+
+from benchmarks import SRC_DIR
+
+TRIGGER = os.path.join(SRC_DIR, "trigger.py")
+# Flags the installed trigger runs with (see its shebang)
+PYTHON_FLAGS = ["-I", "-S"]
+# Modules the trigger may add on top of a bare interpreter
+ALLOWED_EXTRA = {"_socket", "posix", "__main__"}
+
+
+def imported_modules(args, env):
+    """Names of all modules imported by `python -X importtime <args>`."""
+    result = subprocess.run([sys.executable, *PYTHON_FLAGS, "-X", "importtime", *args],
+                            env=env, capture_output=True, text=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "imported package":
+                modules.add(name)
+    return modules
+
+
+def serve(sock, stop):
+    sock.settimeout(0.1)
+    while not stop.is_set():
+        try:
+            conn, _ = sock.accept()
+        except socket.timeout:
+            continue
+        with conn:
+            conn.recv(64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hotkey trigger startup benchmark")
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--budget-ms", type=float, default=10.0,
+                        help="Maximum allowed median overhead above bare interpreter startup (default 10 ms)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "uwhisper.sock")
+        env = dict(os.environ, UWHISPER_SOCKET=path)
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(64)
+        stop = threading.Event()
+        thread = threading.Thread(target=serve, args=(listener, stop), daemon=True)
+        thread.start()
+
+        try:
+            baseline = []
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, *PYTHON_FLAGS, "-c", "pass"], env=env)
+                baseline.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                result = subprocess.run([sys.executable, *PYTHON_FLAGS, TRIGGER, "PING"], env=env)
+                timings.append((time.perf_counter() - start) * 1000)
+                if result.returncode != 0:
+                    print(f"FAIL: trigger exited with {result.returncode}")
+                    return 1
+
+            extra = imported_modules([TRIGGER, "PING"], env) - imported_modules(["-c", "pass"], env)
+        finally:
+            stop.set()
+            thread.join()
+            listener.close()
+
+    median = statistics.median(timings)
+    # Each trigger run is paired with the bare run just before it, so load spikes hit both
+    overhead = statistics.median(t - b for t, b in zip(timings, baseline))
+    print(f"trigger startup over {args.runs} runs: median {median:.1f} ms, "
+          f"min {min(timings):.1f} ms, max {max(timings):.1f} ms")
+    print(f"bare interpreter startup: median {statistics.median(baseline):.1f} ms; "
+          f"trigger overhead: median {overhead:.1f} ms (budget {args.budget_ms:.1f} ms)")
+
+    failed = False
+    if extra - ALLOWED_EXTRA:
+        print(f"FAIL: trigger imports more than the builtin socket module: {sorted(extra - ALLOWED_EXTRA)}")
+        failed = True
+    if overhead > args.budget_ms:
+        print("FAIL: median trigger overhead exceeds budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+import re
+
+_PUNCTUATION = re.compile(r"[^\w\s']", re.UNICODE)
+
+
+def normalize(text):
+    """Lowercase and strip punctuation so formatting differences don't count as errors."""
+    return _PUNCTUATION.sub(" ", text.lower()).split()
+
+
+def word_errors(reference, hypothesis):
+    """Return (edit distance in words, number of reference words)."""
+    ref = normalize(reference)
+    hyp = normalize(hypothesis)
+
+    # Single-row Levenshtein distance over words
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1], len(ref)
+
+
+def wer(pairs):
+    """Corpus-level word error rate over (reference, hypothesis) pairs."""
+    errors = words = 0
+    for reference, hypothesis in pairs:
+        e, n = word_errors(reference, hypothesis)
+        errors += e
+        words += n
+    return errors / words if words else None
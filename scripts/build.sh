@@ -40,20 +40,12 @@ cd "$PROJECT_ROOT"
 
 echo "Building uwhisper-trigger..."
 
-# Build lightweight trigger
-# We exclude heavy modules explicitly to ensure it stays small and starts fast
-"$PYINSTALLER" --onefile \
-            --clean \
-            --distpath "$PROJECT_ROOT/dist" \
-            --workpath "$PROJECT_ROOT/build" \
-            --specpath "$PROJECT_ROOT/build" \
-            --name uwhisper-trigger \
-            --exclude-module=PyQt6 \
-            --exclude-module=torch \
-            --exclude-module=numpy \
-            --exclude-module=faster_whisper \
-            src/client.py
+# The trigger runs on every hotkey press, so it is shipped as a plain script for the
+# system python3 instead of a PyInstaller onefile binary (which unpacks itself to a
+# temp dir on every run). It only uses builtin modules, see src/trigger.py.
+cp src/trigger.py "$PROJECT_ROOT/dist/uwhisper-trigger"
+chmod 755 "$PROJECT_ROOT/dist/uwhisper-trigger"
 
 echo "Build complete!"
 echo "Main Executable: dist/uwhisper"
-echo "Trigger Executable: dist/uwhisper-trigger"
+echo "Trigger Script: dist/uwhisper-trigger (requires python3)"
@@ -44,7 +44,7 @@ Section: utils
 Priority: optional
 Architecture: $ARCH
 Maintainer: Robert <robert@example.com>
-Depends: libportaudio2, wl-clipboard, libnotify-bin
+Depends: libportaudio2, wl-clipboard, libnotify-bin, python3
 Description: Local Voice-to-Text for Ubuntu (Wayland)
  uWhisper is a local Whisper-based transcription tool designed for Ubuntu.
  It supports global hotkeys on Wayland using client-server architecture.
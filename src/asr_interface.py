@@ -1,25 +1,73 @@
+import threading
+from typing import Callable
 from abc import ABC, abstractmethod
 import numpy as np
 
+
+class TranscriptionCancelled(Exception):
+    """Raised by transcribe() when its cancellation token was triggered mid-decode."""
+
+
+class CancellationToken:
+    """
+    Cancels a running transcribe() from another thread.
+
+    Backends call check() between units of work (decoded segments, chunks), so a
+    cancelled decode stops within one unit instead of running to completion.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise TranscriptionCancelled()
+
+
 class ASRModel(ABC):
     @abstractmethod
     def load(self):
         """Load the model resources."""
         pass
 
+    def needs_load(self) -> bool:
+        """Return True if load() would (re)load resources for the current settings."""
+        return True
+
     @abstractmethod
-    def transcribe(self, audio_data: np.ndarray) -> str:
+    def transcribe(self, audio_data: np.ndarray, cancel: CancellationToken = None,
+                   on_segment: Callable[[str], None] = None) -> str:
         """
         Transcribe the given audio data.
         
         Args:
             audio_data: 1D numpy array of float32 audio samples (sampled at 16kHz).
+            cancel: Optional token; once cancelled, the backend stops at its next
+                checkpoint and raises TranscriptionCancelled.
+            on_segment: Optional callback receiving each piece of text as soon as
+                the backend has decoded it, in order. Backends that decode in one
+                pass may never call it; the returned text is always complete.
             
         Returns:
             The transcribed text as a string.
         """
         pass
     
+    def warmup(self):
+        """
+        Run a short synthetic decode right after load() so the first real
+        request does not pay the backend's first-run allocation costs.
+        """
+        noise = np.random.default_rng(0).standard_normal(16000).astype(np.float32) * 1e-3
+        self.transcribe(noise)
+
     @abstractmethod
     def get_settings(self) -> dict:
         """Return current model settings/status."""
@@ -2,41 +2,100 @@ import os
 import logging
 import numpy as np
 import sherpa_onnx
-from huggingface_hub import snapshot_download
-from asr_interface import ASRModel
+from asr_interface import ASRModel, CancellationToken, TranscriptionCancelled
 from config_manager import settings
+import profiles
+from vad import split_on_silence
+from downloader import DownloadManager
+
+MODEL_FILES = ["encoder.int8.onnx", "decoder.int8.onnx", "joiner.int8.onnx", "tokens.txt"]
+WORD_START = "\u2581" # SentencePiece marker for a token that begins a word
+
+
+def overlap_windows(length, window, overlap):
+    """(start, end) sample bounds of fixed windows where neighbours share `overlap` samples."""
+    step = max(1, window - overlap)
+    bounds = []
+    start = 0
+    while start + window < length:
+        bounds.append((start, start + window))
+        start += step
+    # The last window is aligned to the end so it gets full context
+    bounds.append((max(0, length - window), length))
+    return bounds
+
+
+def window_text(bounds, index, tokens, timestamps, samplerate=16000):
+    """
+    Text of window `index` that belongs to it after merging with its neighbours.
+
+    Each overlap is split at its midpoint. A word is kept by the window in which its
+    first token starts on this side of the midpoint, so a word crossing the cut is
+    taken whole from one window and never duplicated or truncated.
+    """
+    start, end = bounds[index]
+    low = (start + bounds[index - 1][1]) / 2 / samplerate if index > 0 else float("-inf")
+    high = (end + bounds[index + 1][0]) / 2 / samplerate if index + 1 < len(bounds) else float("inf")
+
+    kept = []
+    word_time = float("-inf") # Leading continuation tokens belong to a word from the previous window
+    for token, t in zip(tokens, timestamps):
+        if token.startswith(WORD_START) or token.startswith(" "):
+            word_time = start / samplerate + t
+        if low <= word_time < high:
+            kept.append(token)
+    return " ".join("".join(kept).replace(WORD_START, " ").split())
+
+
+def drop_repeated_words(previous, text, max_words=12):
+    """Fallback merge without timestamps: drop the longest prefix of `text` repeating the end of `previous`."""
+    prev_words, words = previous.split(), text.split()
+    for k in range(min(max_words, len(prev_words), len(words)), 0, -1):
+        if [w.lower() for w in prev_words[-k:]] == [w.lower() for w in words[:k]]:
+            return " ".join(words[k:])
+    return text
+
 
 class ASRParakeet(ASRModel):
     def __init__(self):
         self.recognizer = None
         self.model_path = None
         self.loaded_variant = None
+        self.loaded_options = None
         
+    @staticmethod
+    def model_location(variant):
+        """Return (repo_id, cache_dir) for a Parakeet variant."""
+        if variant == "v3_multi":
+            return ("csukuangfj/sherpa-onnx-nemo-parakeet-tdt-0.6b-v3-int8",
+                    os.path.expanduser("~/.cache/uwhisper/parakeet_model_v3"))
+        # Default to v2_en
+        return ("csukuangfj/sherpa-onnx-nemo-parakeet-tdt-0.6b-v2-int8",
+                os.path.expanduser("~/.cache/uwhisper/parakeet_model"))
+
+    @classmethod
+    def is_installed(cls, variant):
+        _, cache_dir = cls.model_location(variant)
+        return all(os.path.exists(os.path.join(cache_dir, f)) for f in MODEL_FILES)
+
+    @classmethod
+    def download(cls, variant, on_progress=None):
+        """Fetch only the files the recognizer loads (no model is loaded). Returns the model dir."""
+        repo_id, cache_dir = cls.model_location(variant)
+        logging.info(f"Downloading Parakeet model ({variant}) from {repo_id}...")
+        DownloadManager(on_progress).download(repo_id, cache_dir, MODEL_FILES, required=MODEL_FILES)
+        # Check and fix metadata (auto-apply fix if needed)
+        cls._ensure_metadata(cache_dir, variant)
+        logging.info("Download complete.")
+        return cache_dir
+
     def _download_model_if_needed(self):
         variant = settings.get("parakeet_variant", "v2_en")
-        
-        if variant == "v3_multi":
-            repo_id = "csukuangfj/sherpa-onnx-nemo-parakeet-tdt-0.6b-v3-int8"
-            cache_dir = os.path.expanduser("~/.cache/uwhisper/parakeet_model_v3")
-        else:
-            # Default to v2_en
-            repo_id = "csukuangfj/sherpa-onnx-nemo-parakeet-tdt-0.6b-v2-int8"
-            cache_dir = os.path.expanduser("~/.cache/uwhisper/parakeet_model")
+        _, cache_dir = self.model_location(variant)
 
-        # Check if files exist (basic check)
-        expected_files = ["encoder.int8.onnx", "decoder.int8.onnx", "joiner.int8.onnx", "tokens.txt"]
-        all_exist = all(os.path.exists(os.path.join(cache_dir, f)) for f in expected_files)
-        
-        if not all_exist:
-            logging.info(f"Downloading Parakeet model ({variant}) from {repo_id}...")
+        if not self.is_installed(variant):
             try:
-                # We download to a specific folder to make it easy to find
-                snapshot_download(repo_id=repo_id, local_dir=cache_dir, local_dir_use_symlinks=False)
-                logging.info("Download complete.")
-                
-                # Check and fix metadata (auto-apply fix if needed)
-                self._ensure_metadata(cache_dir, variant)
-                
+                self.download(variant)
             except Exception as e:
                 logging.error(f"Failed to download Parakeet model: {e}")
                 raise
@@ -45,7 +104,8 @@ class ASRParakeet(ASRModel):
         self.loaded_variant = variant
         return cache_dir
 
-    def _ensure_metadata(self, model_dir, variant):
+    @staticmethod
+    def _ensure_metadata(model_dir, variant):
         """
         Automatically fix metadata (vocab_size, context_size) if missing.
         This allows new downloads to work out-of-the-box without running external scripts.
@@ -86,8 +146,13 @@ class ASRParakeet(ASRModel):
         if os.path.exists(joiner_path):
              add_meta(joiner_path, "vocab_size", vocab_size)
 
+    def _load_options(self):
+        decoding = profiles.parakeet_options()
+        return (self._num_threads(), decoding["decoding_method"], decoding["max_active_paths"])
+
     def load(self):
-        if self.recognizer:
+        options = self._load_options()
+        if self.recognizer and self.loaded_options == options:
             return
 
         model_dir = self._download_model_if_needed()
@@ -95,6 +160,7 @@ class ASRParakeet(ASRModel):
         
         logging.info(f"Loading Parakeet model from {model_dir}...")
         
+        num_threads, decoding_method, max_active_paths = options
         try:
             # Use the helper method from_transducer to avoid complex config construction
             # and ensure compatibility with installed sherpa-onnx version.
@@ -104,26 +170,44 @@ class ASRParakeet(ASRModel):
                 encoder=os.path.join(model_dir, "encoder.int8.onnx"),
                 decoder=os.path.join(model_dir, "decoder.int8.onnx"),
                 joiner=os.path.join(model_dir, "joiner.int8.onnx"),
-                num_threads=4,
+                num_threads=num_threads,
                 sample_rate=16000,
                 feature_dim=128, # Correct dim for Parakeet TDT
-                decoding_method="greedy_search",
+                decoding_method=decoding_method,
+                max_active_paths=max_active_paths,
                 provider="cpu",
                 model_type="nemo_transducer"
             )
 
-            logging.info("Parakeet model loaded successfully.")
+            self.loaded_options = options
 
-            logging.info("Parakeet model loaded successfully.")
+            logging.info(f"Parakeet model loaded successfully ({num_threads} threads, {decoding_method}).")
         except Exception as e:
             logging.error(f"Error loading Parakeet model: {e}")
             raise
 
-    def transcribe(self, audio_data: np.ndarray) -> str:
+    def _num_threads(self):
+        # 0 (default) means one thread per core
+        threads = settings.get("parakeet_num_threads", 0)
+        return threads if threads > 0 else (os.cpu_count() or 4)
+
+    def needs_load(self) -> bool:
+        return self.recognizer is None or self.loaded_options != self._load_options()
+
+    def transcribe(self, audio_data: np.ndarray, cancel: CancellationToken = None, on_segment=None) -> str:
         if not self.recognizer:
             self.load()
             
         try:
+             # Long utterances are split into overlapping windows (or at pauses) and
+             # decoded in bounded batches, which are also the cancellation checkpoints.
+             # Memory stays flat instead of growing with the encoder's input length.
+             if len(audio_data) > settings.get("parakeet_batch_min_seconds", 20.0) * 16000:
+                 return self._transcribe_batched(audio_data, cancel, on_segment)
+
+             if cancel:
+                 cancel.check()
+
              # audio_data is float32 [-1, 1], samples (N,)
              # sherpa-onnx OfflineRecognizer create_stream() takes None
              stream = self.recognizer.create_stream()
@@ -137,10 +221,54 @@ class ASRParakeet(ASRModel):
              result = stream.result
              return result.text.strip()
 
+        except TranscriptionCancelled:
+            logging.info("Parakeet decode cancelled.")
+            raise
         except Exception as e:
             logging.error(f"Parakeet transcription error: {e}")
             raise
 
+    def _transcribe_batched(self, audio_data: np.ndarray, cancel: CancellationToken = None, on_segment=None) -> str:
+        window_s = settings.get("parakeet_segment_seconds", 15.0)
+        overlap_s = settings.get("parakeet_overlap_seconds", 2.0)
+        if overlap_s > 0:
+            # Fixed windows that share `overlap_s` with their neighbours; words near a
+            # window edge are decoded twice and kept from the window they are central in
+            bounds = overlap_windows(len(audio_data), int(window_s * 16000), int(overlap_s * 16000))
+        else:
+            bounds = split_on_silence(audio_data, 16000, max_segment_s=window_s,
+                                      threshold=settings.get("silence_threshold", 0.01))
+        batch_size = max(1, settings.get("parakeet_batch_size", 8))
+        logging.info(f"Decoding {len(audio_data) / 16000:.1f}s as {len(bounds)} segments in batches of {batch_size}")
+
+        texts = []
+        for i in range(0, len(bounds), batch_size):
+            if cancel:
+                cancel.check()
+            streams = []
+            for start, end in bounds[i:i + batch_size]:
+                stream = self.recognizer.create_stream()
+                stream.accept_waveform(16000, audio_data[start:end])
+                streams.append(stream)
+
+            # One batched encoder pass over all segments (uses all configured threads)
+            self.recognizer.decode_streams(streams)
+            batch = []
+            for j, stream in enumerate(streams):
+                result = stream.result
+                if overlap_s > 0 and result.timestamps:
+                    batch.append(window_text(bounds, i + j, result.tokens, result.timestamps))
+                elif overlap_s > 0 and texts:
+                    batch.append(drop_repeated_words(texts[-1], result.text.strip()))
+                else:
+                    batch.append(result.text.strip())
+                texts.append(batch[-1])
+            if on_segment and any(batch):
+                on_segment(" ".join(t for t in batch if t))
+
+        # Streams are created in audio order, so results are already in order
+        return " ".join(t for t in texts if t)
+
     def get_settings(self) -> dict:
         return {
             "type": "parakeet_tdt",
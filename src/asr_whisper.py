@@ -1,55 +1,127 @@
 import logging
 import numpy as np
-from faster_whisper import WhisperModel
-from asr_interface import ASRModel
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+from asr_interface import ASRModel, CancellationToken, TranscriptionCancelled
 from config_manager import settings
+import profiles
+from language_id import LanguageCache
+from downloader import DownloadManager, WHISPER_PATTERNS, WHISPER_REQUIRED
 
 class ASRWhisper(ASRModel):
     def __init__(self):
         self.model = None
+        self.batched = None # Batched pipeline over the same model, for long recordings
         self.current_model_size = None
+        self.loaded_options = None
+        self.language_cache = LanguageCache() # Reused detections for language=auto
         
+    def _load_options(self):
+        return (settings.get("model_size"), settings.get("device"), settings.get("compute_type"),
+                settings.get("whisper_cpu_threads", 0), settings.get("whisper_num_workers", 1))
+
+    @staticmethod
+    def download(model_size, on_progress=None):
+        """Fetch a model into the Hugging Face cache, where WhisperModel(model_size) finds it."""
+        repo_id = f"Systran/faster-whisper-{model_size}"
+        return DownloadManager(on_progress).download_to_hf_cache(repo_id, WHISPER_PATTERNS, required=WHISPER_REQUIRED)
+
     def load(self):
-        desired_size = settings.get("model_size")
-        device = settings.get("device")
-        compute_type = settings.get("compute_type")
+        options = self._load_options()
+        desired_size, device, compute_type, cpu_threads, num_workers = options
 
         # Skip if already loaded with same settings
-        if self.model and self.current_model_size == desired_size:
+        if self.model and self.loaded_options == options:
             return
 
-        logging.info(f"Loading Faster Whisper model ({desired_size}) on {device}...")
+        logging.info(f"Loading Faster Whisper model ({desired_size}, {compute_type}) on {device}...")
         
         try:
-            self.model = WhisperModel(desired_size, device=device, compute_type=compute_type)
+            # cpu_threads=0 lets CTranslate2 pick its default
+            self.model = WhisperModel(desired_size, device=device, compute_type=compute_type,
+                                      cpu_threads=cpu_threads, num_workers=num_workers)
+            self.batched = BatchedInferencePipeline(model=self.model)
             self.current_model_size = desired_size
+            self.loaded_options = options
             logging.info("Faster Whisper model loaded successfully.")
         except Exception as e:
             logging.error(f"Error loading Faster Whisper model: {e}")
             raise
 
-    def transcribe(self, audio_data: np.ndarray) -> str:
+    def warmup(self):
+        """
+        Synthetic decode in a fixed language: going through transcribe() with
+        language=auto would run detection on noise and could cache its guess.
+        """
+        if not self.model:
+            self.load()
+        lang = settings.get("language")
+        noise = np.random.default_rng(0).standard_normal(16000).astype(np.float32) * 1e-3
+        segments, _ = self.model.transcribe(noise, language="en" if lang == "auto" else lang,
+                                            **profiles.whisper_options(1.0))
+        for _ in segments: # Decoding is lazy; pull the segments to actually run it
+            pass
+
+    def needs_load(self) -> bool:
+        return not (self.model and self.loaded_options == self._load_options())
+
+    def transcribe(self, audio_data: np.ndarray, cancel: CancellationToken = None, on_segment=None) -> str:
         if not self.model:
             self.load()
             
         try:
-            # Determine language
+            # Determine language; with "auto" a recent confident detection is reused
             lang = settings.get("language")
+            detect = cached = False
             if lang == "auto":
-                lang = None
+                lang = self.language_cache.get()
+                detect = lang is None
+                cached = not detect
                 
-            segments, info = self.model.transcribe(audio_data, beam_size=5, language=lang)
+            seconds = len(audio_data) / 16000
+            options = profiles.whisper_options(seconds)
+            if self.use_batched(seconds):
+                # VAD-chunked windows decoded independently, `batch_size` per encoder/decoder
+                # call, instead of one 30s window at a time conditioned on the previous text
+                options.pop("condition_on_previous_text", None)
+                batch_size = max(1, settings.get("whisper_batch_size", 8))
+                logging.info(f"Batched decode of {seconds:.0f}s (batch size {batch_size})")
+                segments, info = self.batched.transcribe(audio_data, language=lang, batch_size=batch_size,
+                                                         vad_filter=True, **options)
+            else:
+                segments, info = self.model.transcribe(audio_data, language=lang, **options)
+            if detect:
+                self.language_cache.update(info.language, info.language_probability)
             
+            # Segments are decoded lazily, one 30s window (or one batch) at a time;
+            # not pulling the next one is what actually stops the decode.
             text_parts = []
+            logprobs = []
+            if cancel:
+                cancel.check()
             for segment in segments:
                 text_parts.append(segment.text)
+                logprobs.append(segment.avg_logprob)
+                if on_segment and segment.text.strip():
+                    on_segment(segment.text.strip())
+                if cancel:
+                    cancel.check()
             
+            if cached and logprobs:
+                self.language_cache.check_decode(lang, sum(logprobs) / len(logprobs))
+
             text = " ".join(text_parts).strip()
             return text
+        except TranscriptionCancelled:
+            logging.info("Whisper decode cancelled.")
+            raise
         except Exception as e:
             logging.error(f"Whisper transcription error: {e}")
             raise
 
+    def use_batched(self, audio_seconds):
+        min_seconds = settings.get("whisper_batched_min_seconds", 60.0)
+        return self.batched is not None and 0 < min_seconds <= audio_seconds
+
     def get_settings(self) -> dict:
         return {
             "type": "faster_whisper",
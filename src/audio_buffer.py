@@ -0,0 +1,227 @@
+import os
+import json
+import time
+import fcntl
+import threading
+import numpy as np
+
+INT16_SCALE = 32767.0
+
+
+class AudioBuffer:
+    """
+    Preallocated, growable capture buffer for mono audio.
+
+    Samples are stored in fixed-size chunks that are written in-place by the
+    capture worker thread (CaptureEngine), so capturing never copies or
+    concatenates the recording.
+    Chunks are allocated with np.empty, which only reserves address space; pages
+    are touched as audio arrives. Optionally samples are stored as int16 to halve
+    memory on long dictations.
+
+    The capture worker thread is the only writer. Readers take a snapshot of
+    `length` and only ever look at samples before it, so no locking is needed.
+
+    With `spill_path` (long-form mode) every completed chunk is also appended to
+    that file, and chunks older than the last `memory_chunks` are swapped for
+    read-only np.memmap views of it, so memory stays bounded however long the
+    recording gets. A JSON sidecar (`spill_path + ".json"`) describes the raw file,
+    so a recording survives a crash (see recovery.py) up to its last full chunk,
+    and completely once `finalize()` has written the unfinished chunk at stop.
+    """
+
+    def __init__(self, samplerate=16000, chunk_seconds=60.0, dtype="float32", spill_path=None, memory_chunks=1):
+        self.samplerate = samplerate
+        self.chunk_size = max(1, int(samplerate * chunk_seconds))
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.int16):
+            raise ValueError(f"Unsupported capture dtype: {dtype}")
+        self.chunks = [np.empty(self.chunk_size, dtype=self.dtype)]
+        self.length = 0 # Number of valid samples (published after each write)
+
+        self.spill_path = spill_path
+        self.spill_file = None
+        self.spill_lock = threading.Lock() # Orders chunk spills against finalize()
+        self.spilled = 0 # Samples written to the spill file
+        self.memory_chunks = max(1, memory_chunks)
+        if spill_path:
+            os.makedirs(os.path.dirname(spill_path), exist_ok=True)
+            with open(spill_path + ".json", "w") as f:
+                json.dump({"samplerate": samplerate, "dtype": self.dtype.name,
+                           "started": time.strftime("%Y-%m-%dT%H:%M:%S")}, f)
+            self.spill_file = open(spill_path, "wb")
+            # Held until the file is closed (also on a crash): marks the recording as live for recovery.py
+            fcntl.flock(self.spill_file, fcntl.LOCK_EX)
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def duration(self):
+        return self.length / self.samplerate
+
+    def write(self, block: np.ndarray):
+        """Append a (frames, 1) or (frames,) float32 block. Only the capture worker thread may call this."""
+        data = block.reshape(-1)
+        n = len(data)
+        pos = self.length
+        offset = 0
+
+        while offset < n:
+            chunk_index, chunk_offset = divmod(pos, self.chunk_size)
+            if chunk_index == len(self.chunks):
+                self.chunks.append(np.empty(self.chunk_size, dtype=self.dtype))
+            chunk = self.chunks[chunk_index]
+
+            count = min(n - offset, self.chunk_size - chunk_offset)
+            src = data[offset:offset + count]
+            dst = chunk[chunk_offset:chunk_offset + count]
+            if self.dtype == np.int16:
+                # Clip in-place (the block is the capture worker's own copy) and convert straight into the chunk
+                np.clip(src, -1.0, 1.0, out=src)
+                np.multiply(src, INT16_SCALE, out=dst, casting='unsafe')
+            else:
+                dst[:] = src
+
+            offset += count
+            pos += count
+            if self.spill_file and chunk_offset + count == self.chunk_size:
+                self._spill(chunk_index)
+
+        self.length = pos
+
+    def _spill(self, index):
+        """Persist a completed chunk and release the RAM of chunks outside the memory window."""
+        with self.spill_lock:
+            if self.spill_file is None or self.spilled != index * self.chunk_size:
+                return # Closed, or finalized while this block was being written
+            self.chunks[index].tofile(self.spill_file)
+            self.spill_file.flush()
+            self.spilled += self.chunk_size
+
+        old = index - self.memory_chunks
+        if old >= 0 and not isinstance(self.chunks[old], np.memmap):
+            # Readers holding the in-memory array keep it alive until they are done
+            self.chunks[old] = np.memmap(self.spill_path, dtype=self.dtype, mode="r",
+                                         offset=old * self.chunk_size * self.dtype.itemsize,
+                                         shape=(self.chunk_size,))
+
+    def finalize(self):
+        """Write the samples of the unfinished last chunk when the recording stops (no-op without spilling)."""
+        with self.spill_lock:
+            if self.spill_file is None:
+                return
+            end = self.length
+            pos = self.spilled
+            while pos < end:
+                chunk_index, chunk_offset = divmod(pos, self.chunk_size)
+                count = min(end - pos, self.chunk_size - chunk_offset)
+                self.chunks[chunk_index][chunk_offset:chunk_offset + count].tofile(self.spill_file)
+                pos += count
+            self.spill_file.flush()
+            self.spilled = pos
+
+    def view(self, start=0, end=None) -> np.ndarray:
+        """
+        Return samples [start, end) as a contiguous 1D float32 array.
+
+        When the range lies inside a single float32 chunk this is a zero-copy view;
+        otherwise the range is assembled with exactly one copy.
+        """
+        length = self.length
+        if end is None or end > length:
+            end = length
+        start = max(0, min(start, end))
+
+        first_chunk, first_offset = divmod(start, self.chunk_size)
+        if self.dtype == np.float32 and end - start <= self.chunk_size - first_offset:
+            return self.chunks[first_chunk][first_offset:first_offset + (end - start)]
+
+        out = np.empty(end - start, dtype=np.float32)
+        pos = start
+        while pos < end:
+            chunk_index, chunk_offset = divmod(pos, self.chunk_size)
+            count = min(end - pos, self.chunk_size - chunk_offset)
+            src = self.chunks[chunk_index][chunk_offset:chunk_offset + count]
+            dst = out[pos - start:pos - start + count]
+            if self.dtype == np.int16:
+                np.multiply(src, 1.0 / INT16_SCALE, out=dst)
+            else:
+                dst[:] = src
+            pos += count
+        return out
+
+    def clear(self):
+        """Drop the recorded audio, keeping only the first chunk allocated."""
+        self.length = 0
+        del self.chunks[1:]
+        self.discard()
+        if isinstance(self.chunks[0], np.memmap):
+            self.chunks[0] = np.empty(self.chunk_size, dtype=self.dtype)
+
+    def close(self):
+        """Stop spilling but keep the on-disk copy (e.g. for --recover after a failed decode)."""
+        if self.spill_file:
+            self.spill_file.close()
+            self.spill_file = None
+
+    def discard(self):
+        """Delete the on-disk copy once the recording has been handled (no-op without spilling)."""
+        if not self.spill_path:
+            return
+        self.close()
+        for path in (self.spill_path, self.spill_path + ".json"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.spill_path = None
+
+
+class PreRollRing:
+    """
+    Fixed-size ring holding the most recent audio while not recording.
+
+    The capture worker writes every idle block here (one or two slice copies, no
+    allocation), and the first recording block drains it into the new recording's
+    buffer, so speech that started just before the hotkey press is kept. Both happen
+    on the capture worker thread (CaptureEngine), the only writer of either buffer,
+    so the hand-off needs no locking.
+    """
+
+    def __init__(self, samplerate=16000, seconds=0.5):
+        self.size = int(samplerate * seconds)
+        self.ring = np.zeros(max(1, self.size), dtype=np.float32)
+        self.pos = 0 # Next write position
+        self.filled = 0
+
+    def write(self, block: np.ndarray):
+        if self.size == 0:
+            return
+        data = block.reshape(-1)
+        n = len(data)
+        if n >= self.size:
+            self.ring[:] = data[n - self.size:]
+            self.pos = 0
+            self.filled = self.size
+            return
+        first = min(n, self.size - self.pos)
+        self.ring[self.pos:self.pos + first] = data[:first]
+        self.ring[:n - first] = data[first:]
+        self.pos = (self.pos + n) % self.size
+        self.filled = min(self.size, self.filled + n)
+
+    def drain_into(self, buffer):
+        """Append the buffered audio (oldest first) to an AudioBuffer and empty the ring."""
+        if self.filled:
+            start = (self.pos - self.filled) % self.size
+            if start + self.filled <= self.size:
+                buffer.write(self.ring[start:start + self.filled])
+            else:
+                buffer.write(self.ring[start:])
+                buffer.write(self.ring[:self.pos])
+        self.clear()
+
+    def clear(self):
+        self.pos = 0
+        self.filled = 0
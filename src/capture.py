@@ -0,0 +1,173 @@
+import math
+import queue
+import logging
+import threading
+import time
+import numpy as np
+import sounddevice as sd
+from config_manager import settings
+
+
+def list_input_devices():
+    """Names of all devices that can record."""
+    try:
+        return [d["name"] for d in sd.query_devices() if d["max_input_channels"] > 0]
+    except Exception as e:
+        logging.error(f"Could not list input devices: {e}")
+        return []
+
+
+class PolyphaseResampler:
+    """
+    Streaming rational resampler (e.g. 48 kHz or 44.1 kHz -> 16 kHz).
+
+    A Kaiser-windowed sinc low-pass is split into `up` phases of `taps` coefficients.
+    Each output sample only evaluates the one phase it needs, so the work per output
+    sample is `taps` multiply-adds regardless of the ratio. A whole block is computed
+    with a single gather and einsum. The last `taps - 1` input samples are carried
+    over between blocks, so block boundaries are seamless.
+    """
+
+    def __init__(self, in_rate, out_rate, taps=32, beta=8.0):
+        g = math.gcd(int(in_rate), int(out_rate))
+        self.up = int(out_rate) // g
+        self.down = int(in_rate) // g
+        self.taps = taps
+
+        # Low-pass at 90% of the lower Nyquist frequency, designed at the upsampled rate
+        n = taps * self.up
+        cutoff = 0.9 / (2 * max(self.up, self.down))
+        t = np.arange(n) - (n - 1) / 2
+        h = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(n, beta)
+        h *= self.up / h.sum() # Unity DC gain after zero-stuffing
+        # phases[p, k] multiplies input sample i - k for an output at upsampled index i * up + p
+        self.phases = h.reshape(taps, self.up).T.astype(np.float32).copy()
+        self.tap_offsets = np.arange(taps)
+
+        self.history = np.zeros(taps - 1, dtype=np.float32)
+        self.next_index = (taps - 1) * self.up # Upsampled index of the next output, relative to history start
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        x = np.concatenate((self.history, block.reshape(-1)))
+        end = len(x) * self.up
+        indices = np.arange(self.next_index, end, self.down)
+
+        if len(indices):
+            inputs = indices // self.up
+            window = x[inputs[:, None] - self.tap_offsets[None, :]]
+            out = np.einsum("mk,mk->m", self.phases[indices % self.up], window)
+            self.next_index = indices[-1] + self.down
+        else:
+            out = np.empty(0, dtype=np.float32)
+
+        # Keep the tail as history for the next block and rebase the output index on it
+        consumed = len(x) - (self.taps - 1)
+        self.history = x[consumed:].copy()
+        self.next_index -= consumed * self.up
+        return out.astype(np.float32, copy=False)
+
+
+def capture_options():
+    device = settings.get("input_device", "") or None
+    return (device, settings.get("capture_native_rate", True),
+            settings.get("capture_block_ms", 10), settings.get("capture_latency", "low"))
+
+
+class CaptureEngine:
+    """
+    Input stream at the device's native rate, resampled to `target_rate` off the callback.
+
+    Opening the device at its own rate avoids a hidden resampler in PortAudio/PipeWire,
+    and an explicit block size and latency replace the high-latency defaults. The
+    PortAudio callback only copies the block into a queue; resampling and everything
+    downstream (`on_audio(block)` with 1-D float32 blocks at `target_rate`) happens on
+    a worker thread. Block timing and the reported input latency go to `metrics`.
+
+        with CaptureEngine(on_audio, metrics):
+            ...
+    """
+
+    def __init__(self, on_audio, metrics=None, target_rate=16000):
+        self.on_audio = on_audio
+        self.metrics = metrics
+        self.target_rate = target_rate
+        self.options = capture_options()
+        device, native_rate, block_ms, latency = self.options
+
+        try:
+            info = sd.query_devices(device, "input")
+        except ValueError as e:
+            logging.warning(f"Input device {device!r} not available ({e}); using the default device.")
+            device = None
+            info = sd.query_devices(None, "input")
+        self.device = device
+        self.samplerate = int(info["default_samplerate"]) if native_rate else target_rate
+        self.blocksize = max(1, int(self.samplerate * block_ms / 1000))
+        self.latency = latency
+        self.resampler = None
+        if self.samplerate != target_rate:
+            self.resampler = PolyphaseResampler(self.samplerate, target_rate)
+
+        self.queue = queue.SimpleQueue()
+        self.stream = None
+        self.thread = None
+        self.status_errors = 0 # Overflows etc. reported by PortAudio
+
+    def options_changed(self):
+        return capture_options() != self.options
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self._worker, daemon=True, name="uwhisper-capture")
+        self.thread.start()
+        try:
+            self.stream = sd.InputStream(device=self.device, samplerate=self.samplerate, channels=1,
+                                         dtype="float32", blocksize=self.blocksize,
+                                         latency=self.latency, callback=self._callback)
+            self.stream.start()
+        except Exception:
+            self.queue.put(None)
+            self.thread.join()
+            raise
+
+        logging.info(f"Audio capture running: {self.device or 'default device'} at {self.samplerate} Hz, "
+                     f"{self.blocksize}-frame blocks, input latency {self.stream.latency * 1000:.1f} ms"
+                     + (f", resampling to {self.target_rate} Hz" if self.resampler else ""))
+        if self.metrics:
+            self.metrics.record("input_latency", self.stream.latency)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self.stream.stop()
+            self.stream.close()
+        finally:
+            self.queue.put(None)
+            self.thread.join()
+        if self.status_errors:
+            logging.warning(f"PortAudio reported {self.status_errors} input over/underflows.")
+
+    def _callback(self, indata, frames, time_info, status):
+        # Real-time thread: copy out (PortAudio reuses indata) and return
+        if status:
+            self.status_errors += 1
+        self.queue.put((indata[:, 0].copy(), time.perf_counter()))
+
+    def _worker(self):
+        last_arrival = None
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            block, arrival = item
+            try:
+                start = time.perf_counter()
+                if self.resampler:
+                    block = self.resampler.process(block)
+                self.on_audio(block)
+                if self.metrics:
+                    self.metrics.record("block_processing", time.perf_counter() - start)
+                    if last_arrival is not None:
+                        self.metrics.record("block_interval", arrival - last_arrival)
+            except Exception as e:
+                logging.error(f"Audio processing error: {e}")
+            last_arrival = arrival
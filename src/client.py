@@ -18,5 +18,38 @@ def trigger_server():
         print(f"Error: {e}")
         sys.exit(1)
 
+def send_command(command, wait_result=False):
+    """
+    Send one control command and return the server's reply lines.
+
+    With wait_result, a command that stopped a recording (STOP/TOGGLE) also waits for
+    the session result (TEXT/EMPTY/CANCELLED/ERR) on the same connection.
+    """
+    try:
+        client_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client_sock.connect(config.SOCKET_PATH)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("Error: Server is not running.")
+        sys.exit(1)
+
+    with client_sock:
+        client_sock.sendall(f"{command}\n".encode())
+        reader = client_sock.makefile("rb")
+        reply = reader.readline().decode().rstrip("\n")
+        lines = [reply]
+
+        if reply.startswith("OK STATS "):
+            size = int(reply.split()[2])
+            lines.append(reader.read(size).decode().rstrip("\n"))
+        elif wait_result and reply == "OK STOPPED":
+            lines.append(reader.readline().decode().rstrip("\n"))
+        return lines
+
+def query_server(command):
+    """Send a command and return the server's reply (e.g. STATS)."""
+    lines = send_command(command)
+    # Framed replies carry their payload after the header line
+    return lines[-1]
+
 if __name__ == "__main__":
     trigger_server()
@@ -27,7 +27,50 @@ DEFAULT_CONFIG = {
     "theme": "dark",
     "show_notifications": True,
     "log_dir": "/tmp/uwhisper_logs",
-    "enable_logging": True
+    "enable_logging": True,
+    "streaming_decode": True, # Decode finished segments while still recording
+    "streaming_min_segment_seconds": 5.0,
+    "streaming_pause_ms": 500, # Minimum pause length that ends a segment
+    "streaming_max_segment_seconds": 30.0, # Segments without a pause are cut here
+    "silence_threshold": 0.01, # RMS level below which audio counts as silence
+    "capture_dtype": "float32", # float32 or int16 (halves memory on long dictations)
+    "capture_chunk_seconds": 60.0, # Capture buffer grows in chunks of this length
+    "model_load_policy": "on_record", # startup, on_record, lazy
+    "model_warmup": True, # Run a synthetic decode right after loading
+    "model_cache_budget_mb": 2048, # Memory budget for models kept resident between switches
+    "vad_enabled": True, # Trim silence before ASR and skip empty recordings
+    "vad_max_silence_ms": 800, # Longer internal pauses are shortened to this
+    "vad_padding_ms": 200, # Context kept around speech
+    "vad_min_speech_ms": 150, # Less speech than this counts as an empty recording
+    "parakeet_num_threads": 0, # 0 = one per CPU core
+    "parakeet_batch_min_seconds": 20.0, # Longer audio is split and decoded as a batch
+    "parakeet_segment_seconds": 15.0, # Maximum segment length when splitting
+    "parakeet_overlap_seconds": 2.0, # Overlap between long-audio windows (0 = split at pauses instead)
+    "parakeet_batch_size": 8, # Segments per decode_streams call
+    "whisper_cpu_threads": 0, # 0 = CTranslate2 default (set by --tune)
+    "whisper_num_workers": 1,
+    "whisper_batched_min_seconds": 60.0, # Longer audio uses batched inference (0 = never)
+    "whisper_batch_size": 8, # Windows per batched decode call
+    "decode_workers": 1, # Recordings decoded concurrently; output always follows recording order
+    "incremental_output": False, # Copy/paste each segment as soon as it is decoded
+    "decoding_profile": "auto", # auto, fastest, balanced, accurate (see profiles.py)
+    "profile_auto_short_seconds": 4.0, # With "auto", utterances up to this long use "fastest"
+    "language_cache_seconds": 600, # language=auto: reuse a detected language this long
+    "language_min_confidence": 0.7, # Only detections at least this confident are reused
+    "language_recheck_logprob": -1.0, # Re-detect after a decode scoring below this avg log-prob
+    "preroll_ms": 500, # Audio from just before START that is kept (0 = off)
+    "idle_suspend_seconds": 0, # Close the input stream after this long without recording (0 = never)
+    "input_device": "", # Input device name ("" = system default)
+    "capture_native_rate": True, # Open the device at its own rate and resample to 16 kHz ourselves
+    "capture_block_ms": 10, # PortAudio block size
+    "capture_latency": "low", # PortAudio input latency: "low", "high" or seconds
+    "longform_spill": False, # Write recordings to disk as they grow (bounded RAM, crash recovery)
+    "longform_memory_seconds": 300, # Most recent audio kept in RAM in long-form mode
+    "longform_dir": "~/.cache/uwhisper/recordings",
+    "hf_endpoint": "", # Model hub URL (empty = $HF_ENDPOINT or https://huggingface.co)
+    "download_workers": 4, # Files downloaded in parallel
+    "ui_stall_probe_ms": 16, # Event-loop stall metric tick while the overlay is shown (0 = off)
+    "recover_window_seconds": 120.0 # Longer long-form recordings (and --recover) are decoded in pieces of at most this length
 }
 
 class SettingsManager:
@@ -0,0 +1,226 @@
+import os
+import socket
+import logging
+import selectors
+import threading
+from collections import deque
+
+# Protocol (Unix stream socket, UTF-8):
+#   Requests are one command per line. A client that sends a single command without
+#   a newline and then shuts down its write side (the legacy trigger) works too.
+#   Every command gets exactly one reply, in order, terminated by a newline:
+#     PING    -> PONG
+#     START   -> OK RECORDING | OK ALREADY_RECORDING
+#     STOP    -> OK STOPPED | ERR not recording
+#     TOGGLE  -> OK RECORDING | OK STOPPED | OK DEBOUNCED
+#     CANCEL  -> OK CANCELLED
+#     STATUS  -> OK <state> model=<ready|not_loaded>
+#     STATS   -> OK STATS <n>, a newline, then exactly <n> bytes of report (ending in a newline)
+#   A connection that stopped a recording (STOP or TOGGLE) later receives the result
+#   of that session on the same connection:
+#     TEXT <text> | EMPTY | CANCELLED | ERR <message>
+COMMANDS = ("PING", "START", "STOP", "TOGGLE", "CANCEL", "STATUS", "STATS")
+MAX_LINE = 4096
+
+
+class Connection:
+    def __init__(self, sock):
+        self.sock = sock
+        self.inbuf = b""
+        self.outbuf = deque()
+        self.read_closed = False # Peer shut down its write side
+        self.waiting = 0 # Session results still owed to this client
+        self.registered = False
+
+
+class ControlServer:
+    """
+    Event-driven control plane for the Unix socket.
+
+    A single selector loop serves any number of concurrent, persistent clients, so a
+    slow or stuck client can't block triggers from others. Commands are dispatched to
+    the WhisperServer synchronously (they only flip state); session results are pushed
+    from worker threads through a wakeup socketpair.
+    """
+
+    def __init__(self, server, socket_path):
+        self.server = server
+        self.socket_path = socket_path
+        self.selector = selectors.DefaultSelector()
+        self.connections = {}
+        self.waiters = {} # session -> [Connection] awaiting its result
+        self.lock = threading.Lock()
+        self.pending = deque() # (session, line) published from worker threads
+        self.wakeup_r, self.wakeup_w = socket.socketpair()
+        self.wakeup_r.setblocking(False)
+        self.wakeup_w.setblocking(False)
+
+    def serve(self):
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        listener.listen(16)
+        listener.setblocking(False)
+        self.selector.register(listener, selectors.EVENT_READ, "listener")
+        self.selector.register(self.wakeup_r, selectors.EVENT_READ, "wakeup")
+
+        try:
+            while self.server.running:
+                for key, events in self.selector.select(timeout=0.5):
+                    if key.data == "listener":
+                        self._accept(listener)
+                    elif key.data == "wakeup":
+                        self._drain_published()
+                    else:
+                        conn = key.data
+                        if events & selectors.EVENT_READ:
+                            self._read(conn)
+                        if events & selectors.EVENT_WRITE and conn.sock.fileno() != -1:
+                            self._flush(conn)
+        finally:
+            for conn in list(self.connections.values()):
+                self._close(conn)
+            self.selector.close()
+            listener.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    # --- called from worker threads ---
+
+    def publish(self, session, line):
+        """Deliver a session result to every client waiting for it (thread-safe)."""
+        with self.lock:
+            self.pending.append((session, line))
+        try:
+            self.wakeup_w.send(b"\0")
+        except BlockingIOError:
+            pass # A wakeup is already pending
+
+    # --- selector loop ---
+
+    def _accept(self, listener):
+        try:
+            sock, _ = listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        conn = Connection(sock)
+        self.connections[sock.fileno()] = conn
+        self._update_events(conn)
+
+    def _read(self, conn):
+        try:
+            data = conn.sock.recv(MAX_LINE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close(conn)
+            return
+
+        if data:
+            conn.inbuf += data
+            *lines, conn.inbuf = conn.inbuf.split(b"\n")
+            if len(conn.inbuf) > MAX_LINE:
+                self._send(conn, "ERR line too long")
+                conn.inbuf = b""
+        else:
+            # EOF: whatever is left is a final unterminated command
+            lines = [conn.inbuf] if conn.inbuf.strip() else []
+            conn.inbuf = b""
+            conn.read_closed = True
+            self._update_events(conn)
+
+        for line in lines:
+            self._dispatch(conn, line.decode(errors="replace").strip())
+
+        self._maybe_close(conn)
+
+    def _dispatch(self, conn, command):
+        if not command:
+            return
+        verb = command.upper()
+        if verb not in COMMANDS:
+            self._send(conn, f"ERR unknown command {command}")
+            return
+
+        try:
+            reply, session = self.server.handle_command(verb)
+        except Exception as e:
+            logging.error(f"Control command {verb} failed: {e}")
+            self._send(conn, f"ERR {e}")
+            return
+
+        if session is not None:
+            # This connection stopped a recording; it gets the text when it's ready
+            conn.waiting += 1
+            self.waiters.setdefault(session, []).append(conn)
+        self._send(conn, reply)
+
+    def _drain_published(self):
+        try:
+            while self.wakeup_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+        with self.lock:
+            published, self.pending = self.pending, deque()
+        for session, line in published:
+            for conn in self.waiters.pop(session, []):
+                conn.waiting -= 1
+                if conn.sock.fileno() != -1:
+                    self._send(conn, line)
+                    self._maybe_close(conn)
+
+    def _send(self, conn, text):
+        conn.outbuf.append((text + "\n").encode())
+        self._flush(conn)
+
+    def _flush(self, conn):
+        try:
+            while conn.outbuf:
+                data = conn.outbuf[0]
+                sent = conn.sock.send(data)
+                if sent < len(data):
+                    conn.outbuf[0] = data[sent:]
+                    break
+                conn.outbuf.popleft()
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            self._close(conn)
+            return
+        self._update_events(conn)
+        self._maybe_close(conn)
+
+    def _update_events(self, conn):
+        if conn.sock.fileno() == -1:
+            return
+        events = 0 if conn.read_closed else selectors.EVENT_READ
+        if conn.outbuf:
+            events |= selectors.EVENT_WRITE
+
+        # A half-closed client still owed a result is parked until there is output
+        if events == 0:
+            if conn.registered:
+                self.selector.unregister(conn.sock)
+                conn.registered = False
+        elif conn.registered:
+            self.selector.modify(conn.sock, events, conn)
+        else:
+            self.selector.register(conn.sock, events, conn)
+            conn.registered = True
+
+    def _maybe_close(self, conn):
+        # Legacy one-shot clients are closed once they are answered and owed nothing
+        if conn.read_closed and not conn.outbuf and not conn.waiting:
+            self._close(conn)
+
+    def _close(self, conn):
+        fd = conn.sock.fileno()
+        if fd == -1:
+            return
+        if conn.registered:
+            self.selector.unregister(conn.sock)
+            conn.registered = False
+        self.connections.pop(fd, None)
+        conn.sock.close()
@@ -0,0 +1,255 @@
+import os
+import json
+import time
+import fnmatch
+import hashlib
+import logging
+import http.client
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from config_manager import settings
+
+CHUNK_SIZE = 1024 * 1024
+HF_CACHE_DIR = "~/.cache/huggingface/hub"
+PROGRESS_INTERVAL = 0.1 # Seconds between progress callbacks
+RETRIES = 3 # Reconnects per file (each resumes where the last attempt stopped)
+
+# Files WhisperModel loads (the allow patterns faster_whisper.download_model uses);
+# preprocessor_config.json and the vocabulary file only exist in some repos
+WHISPER_PATTERNS = ["config.json", "preprocessor_config.json", "model.bin", "tokenizer.json", "vocabulary.*"]
+WHISPER_REQUIRED = ["config.json", "model.bin", "tokenizer.json"]
+
+
+class DownloadError(Exception):
+    pass
+
+
+class DownloadCancelled(DownloadError):
+    pass
+
+
+@dataclass(frozen=True)
+class RemoteFile:
+    name: str
+    size: int = None
+    sha256: str = None # LFS files
+    blob_id: str = None # Git blob SHA-1, for small files stored directly in git
+
+
+def endpoint():
+    """Base URL of the model hub: the `hf_endpoint` setting, $HF_ENDPOINT, or huggingface.co."""
+    url = settings.get("hf_endpoint", "") or os.environ.get("HF_ENDPOINT") or "https://huggingface.co"
+    return url.rstrip("/")
+
+
+def open_url(url, headers=None, timeout=30):
+    headers = dict(headers or {})
+    token = os.environ.get("HF_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout)
+
+
+def list_files(repo_id, patterns, revision="main", required=()):
+    """
+    Return (commit sha, [RemoteFile]) for the files of `repo_id` matching the allow
+    `patterns`. Files that match nothing are skipped; only a missing `required` file
+    is an error (rather than a model that fails to load later).
+    """
+    url = f"{endpoint()}/api/models/{repo_id}/revision/{urllib.parse.quote(revision, safe='')}?blobs=true"
+    with open_url(url) as response:
+        info = json.load(response)
+
+    files = []
+    for sibling in info.get("siblings", []):
+        name = sibling["rfilename"]
+        if not any(fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+        lfs = sibling.get("lfs") or {}
+        files.append(RemoteFile(name, sibling.get("size", lfs.get("size")), lfs.get("sha256"), sibling.get("blobId")))
+
+    names = {f.name for f in files}
+    missing = [name for name in required if name not in names]
+    if missing:
+        raise DownloadError(f"{repo_id} has no {', '.join(missing)}")
+    return info.get("sha") or revision, files
+
+
+def new_hasher(remote):
+    """Hash object matching the checksum the hub publishes for `remote` (None if it has none)."""
+    if remote.sha256:
+        return hashlib.sha256()
+    if remote.blob_id and remote.size is not None:
+        hasher = hashlib.sha1()
+        hasher.update(f"blob {remote.size}\0".encode())
+        return hasher
+    return None
+
+
+class DownloadManager:
+    """
+    Fetches selected files of a hub repository, several at a time.
+
+    Each file is written to `<name>.part` and only renamed into place once its size
+    and checksum (SHA-256 for LFS files, the git blob SHA-1 otherwise) match. A
+    `.part` left by an interrupted download is continued with an HTTP Range request
+    instead of starting over. `on_progress(done_bytes, total_bytes)` is called from
+    the worker threads, at most every PROGRESS_INTERVAL seconds, with exact byte
+    counts for the whole download.
+    """
+
+    def __init__(self, on_progress=None, workers=None):
+        self.on_progress = on_progress
+        self.workers = workers or max(1, settings.get("download_workers", 4))
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+        self.done = 0
+        self.total = 0
+        self.last_report = 0.0
+
+    def cancel(self):
+        """Stop all transfers; partial files are kept so the next download resumes them."""
+        self.cancel_event.set()
+
+    def download(self, repo_id, dest_dir, patterns, revision="main", required=()):
+        """Download the files of `repo_id` matching `patterns` into `dest_dir`. Returns the commit sha."""
+        commit, files = list_files(repo_id, patterns, revision, required)
+        self.fetch(repo_id, commit, files, dest_dir)
+        return commit
+
+    def download_to_hf_cache(self, repo_id, patterns, revision="main", required=()):
+        """
+        Download into the Hugging Face cache layout (refs/<revision>, snapshots/<commit>/),
+        so libraries that resolve models through huggingface_hub find them offline.
+        Returns the snapshot directory.
+        """
+        commit, files = list_files(repo_id, patterns, revision, required)
+        repo_dir = os.path.join(os.path.expanduser(HF_CACHE_DIR), "models--" + repo_id.replace("/", "--"))
+        snapshot = os.path.join(repo_dir, "snapshots", commit)
+        self.fetch(repo_id, commit, files, snapshot)
+
+        os.makedirs(os.path.join(repo_dir, "refs"), exist_ok=True)
+        with open(os.path.join(repo_dir, "refs", revision), "w") as f:
+            f.write(commit)
+        return snapshot
+
+    def fetch(self, repo_id, commit, files, dest_dir):
+        os.makedirs(dest_dir, exist_ok=True)
+        pending = []
+        self.done = self.total = 0
+        for remote in files:
+            path = os.path.join(dest_dir, remote.name)
+            self.total += remote.size or 0
+            # Completed files were verified when they were renamed into place
+            if os.path.exists(path) and (remote.size is None or os.path.getsize(path) == remote.size):
+                self.done += remote.size or 0
+            else:
+                if os.path.exists(path + ".part"):
+                    self.done += os.path.getsize(path + ".part") # Resumed below
+                pending.append((remote, path))
+
+        logging.info(f"Downloading {len(pending)} of {len(files)} files from {repo_id} "
+                     f"({(self.total - self.done) / (1024 * 1024):.0f} MiB)")
+        self.report(force=True)
+        if not pending:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+            futures = [pool.submit(self.fetch_file, repo_id, commit, remote, path) for remote, path in pending]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                # Let the other transfers stop at their next chunk instead of finishing
+                self.cancel_event.set()
+                raise
+        self.report(force=True)
+
+    def fetch_file(self, repo_id, commit, remote, path):
+        url = f"{endpoint()}/{repo_id}/resolve/{commit}/{urllib.parse.quote(remote.name)}"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part = path + ".part"
+
+        for attempt in range(RETRIES + 1):
+            try:
+                self.transfer(url, remote, part)
+                break
+            except (urllib.error.URLError, http.client.HTTPException, ConnectionError, TimeoutError) as e:
+                if attempt == RETRIES or self.cancel_event.is_set():
+                    raise DownloadError(f"Could not download {remote.name}: {e}") from e
+                logging.warning(f"Download of {remote.name} interrupted ({e}); resuming.")
+                time.sleep(1 + attempt)
+
+        os.replace(part, path)
+
+    def transfer(self, url, remote, part):
+        """Continue or start `part` and verify it once complete."""
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        if remote.size is not None and offset > remote.size:
+            offset = self.restart(part, offset)
+
+        hasher = new_hasher(remote)
+        if offset and hasher:
+            # The hash covers the whole file, so the bytes already on disk are fed in first
+            with open(part, "rb") as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    hasher.update(chunk)
+
+        if remote.size is None or offset < remote.size:
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            with open_url(url, headers) as response:
+                if offset and response.status != 206:
+                    # The server ignored the range and is sending the whole file
+                    offset = self.restart(part, offset)
+                    hasher = new_hasher(remote)
+                elif offset:
+                    logging.info(f"Resuming {remote.name} at {offset / (1024 * 1024):.1f} MiB")
+
+                with open(part, "ab" if offset else "wb") as out:
+                    while chunk := response.read(CHUNK_SIZE):
+                        if self.cancel_event.is_set():
+                            raise DownloadCancelled("Download cancelled")
+                        out.write(chunk)
+                        if hasher:
+                            hasher.update(chunk)
+                        self.advance(len(chunk))
+
+        self.verify(remote, part, hasher)
+
+    def verify(self, remote, part, hasher):
+        size = os.path.getsize(part)
+        if remote.size is not None and size != remote.size:
+            # Truncated transfer; keep the part so a retry resumes it
+            raise ConnectionError(f"got {size} of {remote.size} bytes")
+        expected = remote.sha256 or remote.blob_id
+        if hasher and hasher.hexdigest() != expected:
+            self.restart(part, size)
+            raise DownloadError(f"Checksum mismatch for {remote.name}")
+
+    def restart(self, part, discarded):
+        os.remove(part)
+        self.advance(-discarded)
+        return 0
+
+    def advance(self, nbytes):
+        with self.lock:
+            self.done += nbytes
+        self.report()
+
+    def report(self, force=False):
+        if not self.on_progress:
+            return
+        now = time.monotonic()
+        with self.lock:
+            if not force and now - self.last_report < PROGRESS_INTERVAL:
+                return
+            self.last_report = now
+            done, total = self.done, self.total
+        try:
+            self.on_progress(done, max(total, done))
+        except Exception as e:
+            logging.error(f"Download progress callback error: {e}")
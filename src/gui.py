@@ -1,11 +1,13 @@
 import sys
 import time
+import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (QApplication, QSystemTrayIcon, QMenu, QWidget, QVBoxLayout, 
                             QLabel, QComboBox, QPushButton, QRadioButton, QGroupBox, QHBoxLayout, QFrame,
                             QDialog, QProgressBar, QMessageBox, QCheckBox, QFileDialog, QLineEdit)
 from PyQt6.QtGui import QIcon, QAction, QFont, QColor, QPalette
-from PyQt6.QtCore import Qt, pyqtSignal, QObject, QTimer
+from PyQt6.QtCore import Qt, pyqtSignal, QObject, QTimer, QEvent
 from config_manager import settings
 from input_simulator import simulate_ctrl_v
 
@@ -79,16 +81,14 @@ STYLESHEET = """
 """
 
 class DownloadDialog(QDialog):
-    def __init__(self, parent=None, target_dir=None, expected_size_mb=670):
+    def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Downloading Model")
         self.setFixedSize(300, 100)
         self.setWindowFlags(Qt.WindowType.Dialog | Qt.WindowType.CustomizeWindowHint | Qt.WindowType.WindowTitleHint)
-        self.target_dir = target_dir
-        self.expected_size_mb = expected_size_mb
         
         layout = QVBoxLayout()
-        self.label = QLabel(f"Downloading model...\nTarget: ~{expected_size_mb} MB")
+        self.label = QLabel("Downloading model...")
         self.label.setWordWrap(True)
         layout.addWidget(self.label)
         
@@ -98,35 +98,155 @@ class DownloadDialog(QDialog):
         layout.addWidget(self.progress)
         
         self.setLayout(layout)
-        
-        # Start Polling
+
+    def set_progress(self, done, total):
+        """Exact byte counts reported by the download manager."""
+        if total <= 0:
+            return
+        self.progress.setValue(int(done * 100 / total))
+        self.label.setText(f"Downloaded: {done / (1024 * 1024):.1f} MB / {total / (1024 * 1024):.1f} MB")
+
+class DownloadWorker(QObject):
+    """Runs server.download_model on a background thread and reports the result via `finished`."""
+    finished = pyqtSignal(bool)
+
+    def __init__(self, server, model, parent=None):
+        super().__init__(parent)
+        self.server = server
+        self.model = model
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True, name="uwhisper-download").start()
+
+    def run(self):
+        # For whisper the name is the model size; parakeet uses the configured variant
+        self.finished.emit(self.server.download_model(self.model))
+
+
+class PasteController(QObject):
+    """
+    Pastes text into the window that had focus before the overlay took it.
+
+    The overlay grabs focus while recording (to catch ESC), so a paste has to wait
+    until the window manager has moved focus back. Instead of polling, requests are
+    queued and released by the next focus change, or by a timeout if focus never
+    moves. The clipboard and input simulation calls block (wl-copy, key delays), so
+    they run in order on a single worker thread rather than on the GUI thread.
+    """
+
+    def __init__(self, app, overlay, server, focus_timeout_ms=1000):
+        super().__init__()
+        self.overlay = overlay
+        self.server = server
+        self.pending = [] # (text to put on the clipboard or None, whether to paste)
+        self.waiting = False
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="uwhisper-paste")
+
+        self.timeout = QTimer(self)
+        self.timeout.setSingleShot(True)
+        self.timeout.setInterval(focus_timeout_ms)
+        self.timeout.timeout.connect(self.release)
+        app.focusWindowChanged.connect(self.on_focus_changed)
+
+    def request(self, text=None, paste=True):
+        """Queue a clipboard update and/or Ctrl+V; runs once the overlay no longer has focus."""
+        self.pending.append((text, paste))
+        if self.waiting:
+            return
+        # Release focus so we can paste into the target window
+        self.overlay.set_focusable(False)
+        if self.overlay.isActiveWindow():
+            # Avoid racing the window manager: wait until it has actually switched focus
+            self.waiting = True
+            self.timeout.start()
+        else:
+            self.release()
+
+    def on_focus_changed(self, window):
+        if self.waiting and not self.overlay.isActiveWindow():
+            self.release()
+
+    def release(self):
+        self.waiting = False
+        self.timeout.stop()
+        actions, self.pending = self.pending, []
+        self.executor.submit(self.run, actions)
+
+    def run(self, actions):
+        for text, paste in actions:
+            try:
+                if text is not None:
+                    self.server.copy_to_clipboard(text)
+                if paste:
+                    paste_start = time.perf_counter()
+                    simulate_ctrl_v()
+                    self.server.metrics.record("paste", time.perf_counter() - paste_start)
+            except Exception as e:
+                logging.error(f"Paste error: {e}")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class EventLoopMonitor(QObject):
+    """
+    Measures how long the Qt event loop is kept from running.
+
+    A precise timer ticks every `interval_ms`; any delay of a tick beyond its interval
+    is time the GUI thread spent blocked. The worst delay of each second is recorded
+    as the "ui_stall" stage, so STATS shows whether the UI ever blocks for more than
+    a frame. The probe only runs while `watched` (the overlay) is visible, i.e. during
+    dictation, so an idle tray app gets no extra wakeups.
+    """
+
+    def __init__(self, metrics, watched, interval_ms=16):
+        super().__init__()
+        self.metrics = metrics
+        self.interval_ms = interval_ms
+        self.interval = interval_ms / 1000
+        self.last_tick = 0.0
+        self.window_start = 0.0
+        self.worst = 0.0
+
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.poll_progress)
-        self.timer.start(500) # Check every 500ms
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+        watched.installEventFilter(self)
+        if watched.isVisible():
+            self.start()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Show:
+            self.start()
+        elif event.type() == QEvent.Type.Hide:
+            self.stop()
+        return False
+
+    def start(self):
+        if self.timer.isActive():
+            return
+        # Time spent stopped is not a stall
+        self.last_tick = self.window_start = time.perf_counter()
+        self.worst = 0.0
+        self.timer.start(self.interval_ms)
 
-    def poll_progress(self):
-        if not self.target_dir:
+    def stop(self):
+        if not self.timer.isActive():
             return
-            
-        try:
-             import os
-             total_size = 0
-             if os.path.exists(self.target_dir):
-                 for dirpath, dirnames, filenames in os.walk(self.target_dir):
-                     for f in filenames:
-                         fp = os.path.join(dirpath, f)
-                         # skip incomplete extensions if any, usually huggingface uses temp names but eventually renames
-                         # just counting all bytes in folder is a good approximation
-                         total_size += os.path.getsize(fp)
-             
-             size_mb = total_size / (1024 * 1024)
-             percent = int((size_mb / self.expected_size_mb) * 100)
-             if percent > 100: percent = 99 # clamping until actual success
-
-             self.progress.setValue(percent)
-             self.label.setText(f"Downloaded: {size_mb:.1f} MB / ~{self.expected_size_mb} MB")
-        except Exception:
-             pass
+        self.timer.stop()
+        if time.perf_counter() - self.window_start >= 0.25:
+            # Keep the partial last window (short dictations would otherwise never be measured)
+            self.metrics.record("ui_stall", max(0.0, self.worst))
+
+    def tick(self):
+        now = time.perf_counter()
+        self.worst = max(self.worst, now - self.last_tick - self.interval)
+        self.last_tick = now
+        if now - self.window_start >= 1.0:
+            self.metrics.record("ui_stall", max(0.0, self.worst))
+            self.window_start = now
+            self.worst = 0.0
+
 
 class SettingsWindow(QWidget):
     saved = pyqtSignal()
@@ -205,6 +325,24 @@ class SettingsWindow(QWidget):
         form_layout.addWidget(lbl_lang)
         form_layout.addWidget(self.combo_lang)
 
+        # Decoding Profile
+        lbl_profile = QLabel("Decoding Profile:")
+        self.combo_profile = QComboBox()
+        self.combo_profile.addItem("Auto (fastest for short commands)", "auto")
+        self.combo_profile.addItem("Fastest", "fastest")
+        self.combo_profile.addItem("Balanced", "balanced")
+        self.combo_profile.addItem("Most Accurate", "accurate")
+        self.combo_profile.setToolTip("Trades transcription accuracy for speed (beam size, fallbacks, Parakeet beam search)")
+        form_layout.addWidget(lbl_profile)
+        form_layout.addWidget(self.combo_profile)
+
+        # Input Device
+        lbl_device = QLabel("Input Device:")
+        self.combo_device = QComboBox()
+        self.combo_device.setToolTip("Opened at its native sample rate and resampled to 16 kHz")
+        form_layout.addWidget(lbl_device)
+        form_layout.addWidget(self.combo_device)
+
         # Output Mode
         lbl_mode = QLabel("Output Mode:")
         form_layout.addWidget(lbl_mode)
@@ -216,6 +354,10 @@ class SettingsWindow(QWidget):
         form_layout.addWidget(self.radio_clipboard)
         form_layout.addWidget(self.radio_paste)
 
+        self.chk_incremental = QCheckBox("Output each sentence as soon as it is decoded")
+        self.chk_incremental.setToolTip("Long dictations appear piece by piece instead of all at once")
+        form_layout.addWidget(self.chk_incremental)
+
         # Notifications (System notifications removed)
         # self.chk_notifications = QCheckBox("Show System Notifications")
         # self.chk_notifications.setToolTip("Enable standard desktop bubbles (notify-send)")
@@ -273,12 +415,27 @@ class SettingsWindow(QWidget):
         
         self.combo_model.setCurrentText(saved_size)
         self.combo_lang.setCurrentText(settings.get("language"))
+        from capture import list_input_devices
+        saved_device = settings.get("input_device", "")
+        self.combo_device.clear()
+        self.combo_device.addItem("System Default", "")
+        for name in list_input_devices():
+            self.combo_device.addItem(name, name)
+        if saved_device and self.combo_device.findData(saved_device) < 0:
+            # Keep a configured device that is currently unplugged
+            self.combo_device.addItem(f"{saved_device} (not connected)", saved_device)
+        self.combo_device.setCurrentIndex(max(0, self.combo_device.findData(saved_device)))
+
+        index = self.combo_profile.findData(settings.get("decoding_profile", "auto"))
+        if index >= 0:
+            self.combo_profile.setCurrentIndex(index)
         
         mode = settings.get("output_mode")
         if mode == "paste":
             self.radio_paste.setChecked(True)
         else:
             self.radio_clipboard.setChecked(True)
+        self.chk_incremental.setChecked(settings.get("incremental_output", False))
             
         # self.chk_notifications.setChecked(settings.get("show_notifications", True))
 
@@ -406,6 +563,8 @@ class SettingsWindow(QWidget):
         
         model = self.combo_model.currentText()
         settings.set("language", self.combo_lang.currentText())
+        settings.set("decoding_profile", self.combo_profile.currentData())
+        settings.set("input_device", self.combo_device.currentData())
         # settings.set("show_notifications", self.chk_notifications.isChecked())
 
         settings.set("enable_logging", self.chk_logging.isChecked())
@@ -413,6 +572,7 @@ class SettingsWindow(QWidget):
         
         mode = "paste" if self.radio_paste.isChecked() else "clipboard"
         settings.set("output_mode", mode)
+        settings.set("incremental_output", self.chk_incremental.isChecked())
         
         # Clean model name for storage/usage
         clean_model = model
@@ -422,63 +582,28 @@ class SettingsWindow(QWidget):
         settings.set("model_size", clean_model)
 
         if self.btn_save.text().startswith("Download"):
-            # Determine target for progress bar
-            import os
-            import os
-            backend_type = self.combo_backend.currentText()
-            
-            if backend_type == "parakeet_tdt":
-                target_dir = os.path.expanduser("~/.cache/uwhisper/parakeet_model") # Default v2
-                expected_size = 641 # Approx for V2/V3 (Real size on disk is ~641 MiB)
-                
-                variant = settings.get("parakeet_variant")
-                if variant == "v3_multi":
-                     target_dir = os.path.expanduser("~/.cache/uwhisper/parakeet_model_v3")
-                     expected_size = 641
-            else:
-                # Faster Whisper
-                # Mapping of approx sizes in MiB
-                # tiny: ~72MB, base: ~140MB, small: ~460MB, medium: ~1.4GB, large-v3: ~2.9GB
-                size_map = {
-                    "tiny": 75,
-                    "base": 145,
-                    "small": 490,
-                    "medium": 1500,
-                    "large-v3": 3000
-                }
-                # Model name is like "whisper base" -> "base"
-                clean_name = clean_model
-                expected_size = size_map.get(clean_name, 500)
-                
-                # HF Cache format: models--Systran--faster-whisper-{size}
-                # Note: This folder appears AFTER download starts, but os.walk handles missing dir gracefully in dialog
-                target_dir = os.path.expanduser(f"~/.cache/huggingface/hub/models--Systran--faster-whisper-{clean_name}")
-
-            # Trigger Download
-            dlg = DownloadDialog(self, target_dir=target_dir, expected_size_mb=expected_size)
-            dlg.show()
-            QApplication.processEvents()
-            
-            import threading
-            self.download_success = False
-            
-            def run_download():
-                # Download expects clean name?
-                # For whisper: yes. For parakeet: it ignores name effectively as it uses repo from config
-                self.download_success = self.server.download_model(clean_model)
-                
-            t = threading.Thread(target=run_download)
-            t.start()
-            
-            while t.is_alive():
-                QApplication.processEvents()
-                time.sleep(0.05)
-                
-            dlg.close()
-            
-            if not self.download_success:
-                QMessageBox.critical(self, "Download Failed", "Could not download model. Check internet connection.")
-                return
+            # Download off the GUI thread; the window closes when the worker reports back
+            self.download_dialog = DownloadDialog(self)
+            self.download_worker = DownloadWorker(self.server, clean_model, self)
+            self.server.signals.download_progress.connect(self.download_dialog.set_progress)
+            self.download_worker.finished.connect(self.on_download_finished)
+            self.btn_save.setEnabled(False)
+            self.download_dialog.show()
+            self.download_worker.start()
+            return
+
+        self.saved.emit()
+        self.close()
+
+    def on_download_finished(self, success):
+        self.server.signals.download_progress.disconnect(self.download_dialog.set_progress)
+        self.download_dialog.close()
+        self.download_dialog = self.download_worker = None
+        self.btn_save.setEnabled(True)
+
+        if not success:
+            QMessageBox.critical(self, "Download Failed", "Could not download model. Check internet connection.")
+            return
 
         self.saved.emit()
         self.close()
@@ -543,6 +668,10 @@ class SystemTrayApp:
         self.menu.addAction(self.quit_action)
         
         self.tray_icon.setContextMenu(self.menu)
+        self.menu.aboutToShow.connect(self.refresh_status)
+        self.ready_text = "Running"
+        self.segments_pasted = False # Incremental output already pasted the current text
+        self.stall_monitor = None
 
         # Windows
         self.callbacks = {
@@ -561,9 +690,19 @@ class SystemTrayApp:
         
         # Connect Signals if server exists
         self.server.signals.state_changed.connect(self.on_state_changed)
-        self.server.signals.amplitude_changed.connect(self.on_amplitude_changed)
         self.server.signals.text_ready.connect(self.on_text_ready)
+        self.server.signals.segment_ready.connect(self.on_segment_ready)
         self.server.signals.notification.connect(self.on_notification)
+        self.server.signals.model_ready.connect(self.on_model_ready)
+
+        # The overlay polls the input level on its own frame tick
+        self.overlay.set_level_source(self.server.enable_metering().read)
+
+        self.paster = PasteController(self.app, self.overlay, self.server)
+        stall_probe_ms = settings.get("ui_stall_probe_ms", 16)
+        if stall_probe_ms > 0:
+            # Only probes while the overlay is shown (a dictation is in progress)
+            self.stall_monitor = EventLoopMonitor(self.server.metrics, self.overlay, stall_probe_ms)
 
 
     def on_cancel_requested(self):
@@ -575,13 +714,17 @@ class SystemTrayApp:
         self.overlay.show()
         self.overlay.set_state(title, message)
         # Hide after delay for notifications
-        QTimer.singleShot(3000, self.overlay.hide)
+        QTimer.singleShot(3000, self.hide_overlay_if_idle)
 
     def on_state_changed(self, state):
         if state == "recording":
             self.overlay.set_focusable(True) # Ensure we can catch ESC
             self.overlay.show()
-            self.overlay.set_state("Recording", "Listening...")
+            if self.server and not self.server.is_model_ready():
+                # Model loads in the background while we record
+                self.overlay.set_state("Recording", "Listening... (loading model)")
+            else:
+                self.overlay.set_state("Recording", "Listening...")
 
         elif state == "loading":
             self.overlay.show()
@@ -592,36 +735,56 @@ class SystemTrayApp:
         elif state == "idle":
             # Just wait a bit then hide? Or hide immediately?
             # Usually 'text_ready' handles the success state
-            QTimer.singleShot(2000, self.overlay.hide)
+            QTimer.singleShot(2000, self.hide_overlay_if_idle)
 
-    def on_amplitude_changed(self, level):
-        # print(f"GUI Amp: {level}") 
-        self.overlay.update_amplitude(level)
+    def refresh_status(self):
+        text = f"Status: {self.ready_text}"
+        if self.server:
+            text += f" | {self.server.metrics.summary_line()}"
+            self.tray_icon.setToolTip(f"uWhisper\n{self.server.metrics.format()}")
+        self.status_action.setText(text)
+
+    def on_model_ready(self, backend, seconds):
+        self.ready_text = f"Ready ({backend}, loaded in {seconds:.1f}s)"
+        self.refresh_status()
+        if self.server and self.server.recording:
+            self.overlay.set_state("Recording", "Listening...")
+
+    def on_segment_ready(self, text):
+        # Incremental output: the server already updated the clipboard in clipboard mode
+        if settings.get("output_mode") != "paste":
+            return
+        self.paster.request(text)
+        self.segments_pasted = True
 
     def on_text_ready(self, text):
         self.overlay.set_state("Done", f"Success")
         
-        # Release focus immediately so we can paste into the target window
-        self.overlay.set_focusable(False) 
-        QApplication.processEvents()
-        
-        # Robustness: Wait for window to actually lose focus (Max 1s)
-        # This avoids race conditions where the OS hasn't switched focus yet
-        start = time.time()
-        while self.overlay.isActiveWindow() and (time.time() - start < 1.0):
-             QApplication.processEvents()
-             time.sleep(0.01) # Small yielding sleep to prevent 100% CPU in the loop
-
-        # Check if we should paste
-        mode = settings.get("output_mode")
-        if mode == "paste":
-            # Attempt paste immediately
-            simulate_ctrl_v()
+        if self.segments_pasted:
+            # Everything was pasted piece by piece; leave the full text on the clipboard
+            # once the queued pieces are through
+            self.segments_pasted = False
+            self.paster.request(text, paste=False)
+        elif settings.get("output_mode") == "paste":
+            # The server already put the text on the clipboard
+            self.paster.request()
+        else:
+            self.overlay.set_focusable(False)
 
+        if self.server and self.server.recording:
+            # The next utterance was already being recorded while this one decoded
+            self.overlay.set_state("Recording", "Listening...")
+            return
 
         # Hide quickly but visible enough to see "Success"
         # Since we are non-focusable and transparent-for-mouse (mostly), it shouldn't block interaction much
-        QTimer.singleShot(800, self.overlay.hide)
+        QTimer.singleShot(800, self.hide_overlay_if_idle)
+
+    def hide_overlay_if_idle(self):
+        # Delayed hides must not close the overlay of a recording started in the meantime
+        if self.server and self.server.recording:
+            return
+        self.overlay.hide()
 
 
     
@@ -635,6 +798,9 @@ class SystemTrayApp:
 
     def on_settings_saved(self):
         print("Settings saved.")
+        if self.server and settings.get("model_load_policy", "on_record") == "startup":
+            # Keep the newly selected model resident right away
+            self.server.preload_model()
 
     def handle_exit_signal(self, signum, frame):
         print(f"Received signal {signum}. Quitting...")
@@ -644,6 +810,7 @@ class SystemTrayApp:
         sys.exit(self.app.exec())
 
     def quit(self):
+        self.paster.shutdown()
         if self.callbacks["stop"]:
             self.callbacks["stop"]()
         self.tray_icon.hide()
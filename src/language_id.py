@@ -0,0 +1,58 @@
+import time
+import logging
+import threading
+from config_manager import settings
+
+
+class LanguageCache:
+    """
+    Remembers the language detected for language=auto between dictations.
+
+    Detection costs an extra encoder pass and is unreliable on short clips, so a
+    confidently detected language is reused for `language_cache_seconds`. The cache
+    is dropped early when a decode in the cached language looks poor (low average
+    log-probability), which usually means the user switched languages.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.language = None
+        self.probability = 0.0
+        self.detected_at = 0.0
+
+    def get(self):
+        """The cached language, or None if detection should run."""
+        with self.lock:
+            if self.language is None:
+                return None
+            if time.monotonic() - self.detected_at > settings.get("language_cache_seconds", 600):
+                logging.info(f"Cached language '{self.language}' expired; re-detecting.")
+                self.language = None
+                return None
+            return self.language
+
+    def update(self, language, probability):
+        """Store a fresh detection result if it is confident enough."""
+        if probability < settings.get("language_min_confidence", 0.7):
+            logging.info(f"Detected '{language}' with low confidence ({probability:.2f}); not caching.")
+            return
+        with self.lock:
+            if language != self.language:
+                logging.info(f"Caching detected language '{language}' ({probability:.2f}).")
+            self.language = language
+            self.probability = probability
+            self.detected_at = time.monotonic()
+
+    def check_decode(self, language, avg_logprob):
+        """Invalidate the cache if a decode in the cached `language` scored poorly."""
+        if avg_logprob is None or avg_logprob >= settings.get("language_recheck_logprob", -1.0):
+            return
+        with self.lock:
+            if self.language == language:
+                logging.info(f"Poor decode in cached language '{language}' (avg logprob {avg_logprob:.2f}); "
+                             "re-detecting next time.")
+                self.language = None
+
+    def invalidate(self):
+        with self.lock:
+            self.language = None
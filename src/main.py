@@ -1,13 +1,19 @@
-import argparse
 import sys
 import os
-import threading
-import time
-import socket
 
 # Ensure we can find our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Fast path for hotkeys: skip argparse, settings and logging setup entirely
+if __name__ == "__main__" and sys.argv[1:2] == ["--trigger"]:
+    import trigger
+    sys.exit(trigger.main(sys.argv[2:]))
+
+import argparse
+import threading
+import time
+import socket
+
 import logging
 from config_manager import settings
 from config import SOCKET_PATH
@@ -70,6 +76,12 @@ def main():
     parser.add_argument("--server", action="store_true", help="Start the uWhisper background server (headless)")
     parser.add_argument("--gui", action="store_true", help="Start with GUI and System Tray")
     parser.add_argument("--trigger", action="store_true", help="Trigger recording/transcription (Client)")
+    parser.add_argument("--command", metavar="VERB", help="Send a control command (START, STOP, CANCEL, STATUS, PING, TOGGLE)")
+    parser.add_argument("--wait", action="store_true", help="With --command STOP/TOGGLE, wait for and print the transcription")
+    parser.add_argument("--stats", action="store_true", help="Print per-stage latency statistics of the running server")
+    parser.add_argument("--tune", action="store_true", help="Benchmark thread counts/compute types and save the fastest to config.json")
+    parser.add_argument("--tune-clip", metavar="PATH", help="Local WAV/FLAC clip to tune on (default: synthetic clip)")
+    parser.add_argument("--recover", action="store_true", help="Transcribe long-form recordings left behind by a crash")
     
     args = parser.parse_args()
     
@@ -80,6 +92,26 @@ def main():
         client.trigger_server()
         return
 
+    if args.command:
+        import client
+        for line in client.send_command(args.command.upper(), wait_result=args.wait):
+            print(line)
+        return
+
+    if args.stats:
+        import client
+        print(client.query_server("STATS"))
+        return
+
+    if args.tune:
+        import tuner
+        tuner.run(args.tune_clip)
+        return
+
+    if args.recover:
+        import recovery
+        sys.exit(recovery.run())
+
     # Check if already running before starting Server or GUI
     if is_server_running():
         print("uWhisper is already running!")
@@ -0,0 +1,39 @@
+import math
+import numpy as np
+
+
+class LevelMeter:
+    """
+    Input level for the overlay, computed on the capture path at a fixed display rate.
+
+    `process()` runs on the capture worker thread: it only accumulates the block's
+    sum of squares (a dot product, no temporary arrays) and publishes a new level
+    once `samplerate / rate_hz` samples have been seen. The GUI reads `level` on its
+    own frame tick. A single float attribute store is atomic, so no lock or Qt signal
+    is involved, and nothing queues up when the GUI is busy.
+    """
+
+    def __init__(self, samplerate, rate_hz=30):
+        self.interval = max(1, int(samplerate / rate_hz)) # Samples per published level
+        self.energy = 0.0
+        self.count = 0
+        self.level = 0.0 # Latest published level, 0.0 to 1.0
+
+    def process(self, block):
+        samples = block[:, 0] if block.ndim > 1 else block
+        self.energy += float(np.dot(samples, samples))
+        self.count += len(samples)
+        if self.count >= self.interval:
+            rms = math.sqrt(self.energy / self.count)
+            # Voice is usually low amplitude (0.01 - 0.2), boost it for visuals
+            self.level = min(rms * 10, 1.0)
+            self.energy = 0.0
+            self.count = 0
+
+    def read(self):
+        return self.level
+
+    def reset(self):
+        self.energy = 0.0
+        self.count = 0
+        self.level = 0.0
@@ -0,0 +1,110 @@
+import time
+import threading
+from collections import deque
+
+# Stages reported by STATS, in pipeline order
+STAGES = [
+    "first_frame",      # toggle received -> first audio frame captured
+    "recording",        # first frame -> stop toggle
+    "assembly",         # stop -> audio buffer ready (view + VAD)
+    "load",             # non-streamed job waiting for the model before its decode
+    "model_load",       # model load + warm-up itself, whenever it runs (also in the background)
+    "decode",           # model decode (streaming: tail + pending segments)
+    "clipboard",        # wl-copy
+    "paste",            # input simulation
+    "stop_to_first",    # stop toggle -> first segment output (incremental output)
+    "stop_to_text",     # stop toggle -> text on the clipboard
+    "input_latency",    # input latency reported by PortAudio when the stream opens
+    "block_interval",   # time between capture callbacks
+    "block_processing", # resampling + buffering of one captured block
+    "ui_stall",         # worst Qt event-loop delay per second while the overlay is shown
+]
+
+
+class RollingHistogram:
+    """The most recent samples of one stage, summarized on demand."""
+
+    def __init__(self, size=200):
+        self.samples = deque(maxlen=size)
+
+    def add(self, value):
+        self.samples.append(value)
+
+    def summary(self):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        n = len(ordered)
+        return {
+            "count": n,
+            "last": self.samples[-1],
+            "p50": ordered[n // 2],
+            "p95": ordered[min(n - 1, int(n * 0.95))],
+            "max": ordered[-1],
+        }
+
+
+class SessionTimer:
+    """Timestamps of one dictation session; marking a stage is a single dict store."""
+
+    def __init__(self):
+        self.marks = {"toggle": time.perf_counter()}
+
+    def mark(self, stage):
+        self.marks[stage] = time.perf_counter()
+
+    def elapsed(self, start, end):
+        if start in self.marks and end in self.marks:
+            return self.marks[end] - self.marks[start]
+        return None
+
+
+class Metrics:
+    """Rolling per-stage latency histograms, queryable via the STATS socket command."""
+
+    def __init__(self, size=200):
+        self.size = size
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.sessions = 0
+
+    def record(self, stage, seconds):
+        if seconds is None:
+            return
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = RollingHistogram(self.size)
+            histogram.add(seconds)
+
+    def record_session(self, session):
+        """Derive stage durations from a finished session's marks."""
+        self.sessions += 1
+        self.record("first_frame", session.elapsed("toggle", "first_frame"))
+        self.record("recording", session.elapsed("first_frame", "stop"))
+        self.record("assembly", session.elapsed("stop", "assembled"))
+        self.record("stop_to_first", session.elapsed("stop", "first_output"))
+        self.record("stop_to_text", session.elapsed("stop", "clipboard_done"))
+
+    def snapshot(self):
+        with self.lock:
+            return {stage: h.summary() for stage, h in self.histograms.items()}
+
+    def format(self):
+        """Multi-line text report (one line per stage, times in ms)."""
+        snapshot = self.snapshot()
+        lines = [f"sessions {self.sessions}"]
+        for stage in STAGES + sorted(set(snapshot) - set(STAGES)):
+            s = snapshot.get(stage)
+            if not s:
+                continue
+            lines.append(f"{stage:<16} n={s['count']:<4} last={s['last'] * 1000:8.1f} "
+                         f"p50={s['p50'] * 1000:8.1f} p95={s['p95'] * 1000:8.1f} max={s['max'] * 1000:8.1f}")
+        return "\n".join(lines)
+
+    def summary_line(self):
+        """Short summary for the tray menu."""
+        s = self.snapshot().get("stop_to_text")
+        if not s:
+            return "no dictations yet"
+        return f"last {s['last']:.2f}s, p50 {s['p50']:.2f}s, p95 {s['p95']:.2f}s"
@@ -0,0 +1,83 @@
+import os
+import logging
+from collections import OrderedDict
+
+# Rough resident sizes (MiB) used when the RSS delta of a load cannot be measured
+ESTIMATED_MODEL_MB = {
+    "tiny": 150,
+    "base": 250,
+    "small": 600,
+    "medium": 1600,
+    "large-v3": 3200,
+    "parakeet_tdt": 900,
+}
+
+
+def current_rss_mb():
+    """Resident set size of this process in MiB (0 if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+
+def estimate_model_mb(key):
+    backend, name = key[0], key[1]
+    if backend == "parakeet_tdt":
+        return ESTIMATED_MODEL_MB["parakeet_tdt"]
+    return ESTIMATED_MODEL_MB.get(name, 1000)
+
+
+class ModelCache:
+    """
+    Keeps several loaded ASRModel instances resident under a memory budget.
+
+    Models are keyed by (backend, variant/size, device, compute_type). Looking up a
+    resident model is an O(1) dictionary hit that also marks it most recently used;
+    when the budget is exceeded the least recently used models are dropped.
+    """
+
+    def __init__(self, budget_mb):
+        self.budget_mb = budget_mb
+        self.models = OrderedDict() # key -> (model, size_mb), oldest first
+
+    def __contains__(self, key):
+        return key in self.models
+
+    def __len__(self):
+        return len(self.models)
+
+    @property
+    def used_mb(self):
+        return sum(size for _, size in self.models.values())
+
+    def get(self, key):
+        entry = self.models.get(key)
+        if entry is None:
+            return None
+        self.models.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, model, size_mb):
+        self.models[key] = (model, size_mb)
+        self.models.move_to_end(key)
+        self.evict_to_budget(keep=key)
+
+    def evict_to_budget(self, keep=None):
+        """Evict least recently used models until the budget is met (never `keep`)."""
+        for key in list(self.models):
+            if self.used_mb <= self.budget_mb:
+                break
+            if key == keep:
+                continue
+            self.evict(key)
+
+    def evict(self, key):
+        entry = self.models.pop(key, None)
+        if entry is not None:
+            logging.info(f"Evicting model {key} ({entry[1]:.0f} MiB) from cache")
+
+    def clear(self):
+        self.models.clear()
@@ -1,8 +1,24 @@
-import sys
-import random
-from PyQt6.QtWidgets import QWidget, QLabel, QHBoxLayout, QVBoxLayout, QApplication
-from PyQt6.QtCore import Qt, QTimer, pyqtSlot, pyqtSignal
-from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QFont
+import time
+import numpy as np
+from PyQt6.QtWidgets import QWidget, QApplication
+from PyQt6.QtCore import Qt, QTimer, QRect, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor, QBrush, QFont, QPixmap
+
+BAR_COUNT = 20
+BAR_WIDTH = 8
+BAR_GAP = 4
+BAR_MAX_HEIGHT = 60
+PILL_WIDTH = 400
+PILL_HEIGHT = 100
+PILL_MARGIN_BOTTOM = 100
+
+# Animation frame interval (ms) per state; other states are drawn once and stay static
+FRAME_INTERVALS = {
+    "recording": 33,    # ~30 fps, follows the input level
+    "transcribing": 50, # ~20 fps spinner
+    "loading": 50,
+}
+
 
 class OverlayWindow(QWidget):
     cancelled = pyqtSignal()
@@ -11,52 +27,78 @@ class OverlayWindow(QWidget):
         super().__init__()
         # Window Flags: Frameless, On Top, Tool
         # We remove WindowDoesNotAcceptFocus to allow catching ESC key
-        # Window Flags: Frameless, On Top, Tool
-        # Initial flags
         self.base_flags = Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool
         self.setWindowFlags(self.base_flags)
 
-    def set_focusable(self, focusable: bool):
-        if not focusable:
-            self.setWindowFlags(self.base_flags | Qt.WindowType.WindowDoesNotAcceptFocus)
-        else:
-            self.setWindowFlags(self.base_flags)
-        # We need to show again to apply flag changes, but we want to avoid flickering if possible
-        # Typically flags change requires hide/show, but let's try just setWindowFlags + show
-        if self.isVisible():
-             self.show()
-
-        
         # Transparent Background & Click-through
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
-        # Note: If we want to catch keys, we might need to disable TransparentForMouseEvents 
+        # Note: If we want to catch keys, we might need to disable TransparentForMouseEvents
         # OR just rely on focus. Let's try keeping it for now.
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
-        
-        # Fullscreen to bypass Wayland positioning restrictions
-        self.screen_geo = QApplication.primaryScreen().geometry()
-        self.setGeometry(self.screen_geo)
+
+        # Fullscreen to bypass Wayland positioning restrictions. Only the pill (or just
+        # its bars) is ever repainted, so the size of the surface costs little.
+        self.pill_rect = QRect()
+        self.bars_rect = QRect()
+        self.bars_center_y = 0
+        self.background = None # Cached pixmap of the pill and its status text
+        self.setGeometry(QApplication.primaryScreen().geometry())
 
         # State
-        self.bars = [0.1] * 20  # 20 bars for visualization
+        self.level_source = None # Callable returning the current input level (0.0 - 1.0)
+        self.bars = np.full(BAR_COUNT, 0.1)
+        positions = np.arange(BAR_COUNT)
+        # Middle bars higher than edges
+        self.bar_scale = 1.0 - np.abs(positions - BAR_COUNT / 2) / (BAR_COUNT / 2) * 0.5
+        self.bar_phase = positions * 0.5
+        self.rng = np.random.default_rng()
         self.target_amplitude = 0.0
+        self.state = "idle"
         self.state_text = "Ready"
-        self.is_transcribing = False
 
-        # Timer for smooth animation
-        self.anim_timer = QTimer()
+        # Animation timer; runs only while visible, at a rate that depends on the state
+        self.anim_timer = QTimer(self)
         self.anim_timer.timeout.connect(self.update_animation)
-        self.anim_timer.start(30) 
-        
+
+    def set_level_source(self, source):
+        self.level_source = source
+
+    def set_focusable(self, focusable: bool):
+        if not focusable:
+            self.setWindowFlags(self.base_flags | Qt.WindowType.WindowDoesNotAcceptFocus)
+        else:
+            self.setWindowFlags(self.base_flags)
+        # We need to show again to apply flag changes, but we want to avoid flickering if possible
+        # Typically flags change requires hide/show, but let's try just setWindowFlags + show
+        if self.isVisible():
+             self.show()
+
     def showEvent(self, event):
         super().showEvent(event)
         # Ensure fullscreen
         self.setGeometry(QApplication.primaryScreen().geometry())
+        self.update_timer()
         # Request focus to catch ESC key
         self.activateWindow()
         self.raise_()
 
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.anim_timer.stop()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # The pill sits at the bottom center of the screen, the bars above its text
+        w, h = self.width(), self.height()
+        self.pill_rect = QRect((w - PILL_WIDTH) // 2, h - PILL_HEIGHT - PILL_MARGIN_BOTTOM, PILL_WIDTH, PILL_HEIGHT)
+        total_bar_width = BAR_COUNT * (BAR_WIDTH + BAR_GAP)
+        self.bars_center_y = self.pill_rect.y() + (PILL_HEIGHT - 30) // 2 + 10
+        self.bars_rect = QRect(self.pill_rect.x() + (PILL_WIDTH - total_bar_width) // 2,
+                               self.bars_center_y - BAR_MAX_HEIGHT // 2 - 1,
+                               total_bar_width, BAR_MAX_HEIGHT + 2)
+        self.background = None
+
     def keyPressEvent(self, event):
         if event.key() == Qt.Key.Key_Escape:
             self.cancelled.emit()
@@ -67,104 +109,87 @@ class OverlayWindow(QWidget):
     def update_amplitude(self, level):
         # Boost low levels for visibility
         if level > 0.001:
-            self.target_amplitude = level * 15.0 # HUGE Boost for visibility
-            if self.target_amplitude > 1.0: self.target_amplitude = 1.0
-        else:
-            self.target_amplitude = 0.0
-
-    def update_amplitude(self, level):
-        # Boost low levels for visibility
-        if level > 0.001:
-            self.target_amplitude = level * 15.0 # HUGE Boost for visibility
-            if self.target_amplitude > 1.0: self.target_amplitude = 1.0
+            self.target_amplitude = min(level * 15.0, 1.0) # HUGE Boost for visibility
         else:
             self.target_amplitude = 0.0
 
     def set_state(self, state, text=""):
-        self.state_text = text if text else state.title()
-        self.is_transcribing = (state == "transcribing")
-        self.update()
-        
-        if state == "idle":
-            # Fade out or hide after a delay?
-            # For now, parent controller handles show/hide
-            pass
+        self.state = state.lower()
+        state_text = text if text else state.title()
+        if state_text != self.state_text:
+            self.state_text = state_text
+            self.background = None
+        self.update_timer()
+        self.update(self.pill_rect)
+
+    def update_timer(self):
+        interval = FRAME_INTERVALS.get(self.state)
+        if interval is None or not self.isVisible():
+            self.anim_timer.stop()
+        elif not self.anim_timer.isActive() or self.anim_timer.interval() != interval:
+            self.anim_timer.start(interval)
 
     def update_animation(self):
-        if not self.isVisible():
-            return
-            
-        # Update bars logic
-        for i in range(len(self.bars)):
+        if self.level_source:
+            self.update_amplitude(self.level_source())
+
+        # Bar targets for the whole frame at once
+        if self.state == "recording":
             # Random variations based on target amplitude to simulate "wave"
-            # Middle bars higher than edges
-            dist_from_center = abs(i - len(self.bars)/2) / (len(self.bars)/2)
-            scale = 1.0 - (dist_from_center * 0.5)
-            
-            target = self.target_amplitude * scale * random.uniform(0.8, 1.2)
-            if self.is_transcribing:
-                # Spinning wave effect
-                import math
-                t = time.time() * 10
-                target = (math.sin(t + i*0.5) + 1) / 4 + 0.2
-
-            # Smooth approach
-            self.bars[i] += (target - self.bars[i]) * 0.2
-            
-            # Decay (silence)
-            self.target_amplitude *= 0.95
-
-        self.update() # Trigger repaint
+            targets = self.target_amplitude * self.bar_scale * self.rng.uniform(0.8, 1.2, BAR_COUNT)
+        else:
+            # Spinning wave effect
+            targets = (np.sin(time.monotonic() * 10 + self.bar_phase) + 1) / 4 + 0.2
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
+        # Smooth approach
+        self.bars += (targets - self.bars) * 0.2
+        # Decay (silence)
+        self.target_amplitude *= 0.95
+
+        self.update(self.bars_rect) # Repaint only the bars
+
+    def render_background(self):
+        """Draw the static pill and status text into a pixmap (redone only when the text changes)."""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(PILL_WIDTH * ratio), int(PILL_HEIGHT * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        w, h = self.width(), self.height()
-        
-        # Define the "Virtual" overlay area (bottom center)
-        overlay_w = 400
-        overlay_h = 100
-        overlay_x = (w - overlay_w) // 2
-        overlay_y = h - overlay_h - 100 # 100px padding from bottom
-        
-        # 1. Draw Background Pill (in virtual area)
+        # 1. Background Pill
         bg_color = QColor(20, 20, 20, 220) # Dark semi-transparent
         painter.setBrush(QBrush(bg_color))
         painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawRoundedRect(overlay_x, overlay_y, overlay_w, overlay_h, 20, 20)
+        painter.drawRoundedRect(0, 0, PILL_WIDTH, PILL_HEIGHT, 20, 20)
 
-        # 2. Draw Text Status
+        # 2. Text Status
         painter.setPen(QColor(255, 255, 255))
         painter.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
-        text_rect = painter.boundingRect(0, 0, overlay_w, 30, Qt.AlignmentFlag.AlignCenter, self.state_text)
-        painter.drawText(overlay_x + (overlay_w - text_rect.width()) // 2, overlay_y + overlay_h - 20, self.state_text)
+        text_rect = painter.boundingRect(0, 0, PILL_WIDTH, 30, Qt.AlignmentFlag.AlignCenter, self.state_text)
+        painter.drawText((PILL_WIDTH - text_rect.width()) // 2, PILL_HEIGHT - 20, self.state_text)
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        if self.background is None:
+            self.background = self.render_background()
 
-        # 3. Draw Visualization Bars
-        bar_w = 8
-        gap = 4
-        total_bar_width = len(self.bars) * (bar_w + gap)
-        start_x = overlay_x + (overlay_w - total_bar_width) // 2
-        
-        center_y = overlay_y + (overlay_h - 30) // 2 + 10 # Vertically centered above text
+        # Qt clips to the dirty region, so bar frames only touch the bars
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.drawPixmap(self.pill_rect.topLeft(), self.background)
 
+        # 3. Visualization Bars
         color_start = QColor("#007acc")
         color_loud = QColor("#00ff88") # Greenish for loud
+        heights = np.minimum(10 + self.bars * 50, BAR_MAX_HEIGHT)
 
-        for i, height_factor in enumerate(self.bars):
-            # Height calculation (max 50px)
-            bar_h = 10 + (height_factor * 50)
-            if bar_h > 60: bar_h = 60
-            
-            x = start_x + i * (bar_w + gap)
-            y = center_y - (bar_h / 2)
-            
+        painter.setPen(Qt.PenStyle.NoPen)
+        for i, (height_factor, bar_h) in enumerate(zip(self.bars, heights)):
+            x = self.bars_rect.x() + i * (BAR_WIDTH + BAR_GAP)
+            y = self.bars_center_y - bar_h / 2
             # Dynamic Color
-            c = QColor(color_start)
-            if height_factor > 0.6:
-                c = color_loud
-            
-            painter.setBrush(QBrush(c))
-            painter.drawRoundedRect(int(x), int(y), int(bar_w), int(bar_h), 4, 4)
-
-import time
+            painter.setBrush(QBrush(color_loud if height_factor > 0.6 else color_start))
+            painter.drawRoundedRect(int(x), int(y), BAR_WIDTH, int(bar_h), 4, 4)
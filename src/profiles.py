@@ -0,0 +1,68 @@
+from config_manager import settings
+
+# Named latency/accuracy trade-offs, mapped to concrete options per backend.
+# For faster-whisper "accurate" matches the previous fixed behavior (its library defaults).
+# Parakeet previously always used greedy_search, as "fastest" and "balanced" still do;
+# "accurate" switches it to modified_beam_search.
+PROFILES = {
+    "fastest": {
+        "whisper": {
+            "beam_size": 1,
+            "best_of": 1,
+            "temperature": 0.0, # No fallback re-decodes
+            "without_timestamps": True,
+            "condition_on_previous_text": False,
+        },
+        "parakeet": {"decoding_method": "greedy_search", "max_active_paths": 4},
+    },
+    "balanced": {
+        "whisper": {
+            "beam_size": 2,
+            "best_of": 2,
+            "temperature": [0.0, 0.4, 0.8],
+            "without_timestamps": True,
+            "condition_on_previous_text": True,
+        },
+        "parakeet": {"decoding_method": "greedy_search", "max_active_paths": 4},
+    },
+    "accurate": {
+        "whisper": {
+            "beam_size": 5,
+            "best_of": 5,
+            "temperature": [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+            "without_timestamps": False,
+            "condition_on_previous_text": True,
+        },
+        "parakeet": {"decoding_method": "modified_beam_search", "max_active_paths": 4},
+    },
+}
+
+PROFILE_NAMES = ["auto"] + list(PROFILES)
+
+
+def resolve(audio_seconds=None):
+    """
+    Name of the profile to use for an utterance of `audio_seconds`.
+
+    "auto" picks "fastest" for short commands and "balanced" otherwise; without a
+    length (e.g. when loading a model) it resolves to "balanced".
+    """
+    name = settings.get("decoding_profile", "auto")
+    if name in PROFILES:
+        return name
+    if audio_seconds is not None and audio_seconds <= settings.get("profile_auto_short_seconds", 4.0):
+        return "fastest"
+    return "balanced"
+
+
+def whisper_options(audio_seconds=None):
+    """faster-whisper transcribe() keyword arguments for an utterance."""
+    return dict(PROFILES[resolve(audio_seconds)]["whisper"])
+
+
+def parakeet_options():
+    """
+    sherpa-onnx recognizer options. These are fixed when the recognizer is created,
+    so they follow the configured profile rather than the utterance length.
+    """
+    return dict(PROFILES[resolve()]["parakeet"])
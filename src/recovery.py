@@ -0,0 +1,126 @@
+import os
+import glob
+import json
+import fcntl
+import logging
+import numpy as np
+from config_manager import settings
+from audio_buffer import AudioBuffer, INT16_SCALE
+from vad import find_last_pause
+
+
+def recordings_dir():
+    return os.path.expanduser(settings.get("longform_dir", "~/.cache/uwhisper/recordings"))
+
+
+def in_use(path):
+    """True while a running process still records or decodes `path` (it holds a lock on the file)."""
+    try:
+        with open(path, "rb") as f:
+            fcntl.flock(f, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    except OSError:
+        pass
+    return False
+
+
+def pending_recordings(directory=None):
+    """
+    Raw files of long-form recordings that were never handled (e.g. after a crash),
+    oldest first. Recordings a running server is still working on are skipped.
+    """
+    directory = directory or recordings_dir()
+    raws = (p[:-len(".json")] for p in glob.glob(os.path.join(directory, "*.raw.json")))
+    return sorted(p for p in raws if os.path.exists(p) and not in_use(p))
+
+
+def open_recording(path):
+    """Return (memmap of the samples, samplerate) without reading the file into memory."""
+    with open(path + ".json") as f:
+        meta = json.load(f)
+    dtype = np.dtype(meta["dtype"])
+    samples = os.path.getsize(path) // dtype.itemsize
+    if samples == 0:
+        return np.zeros(0, dtype=np.float32), meta["samplerate"]
+    return np.memmap(path, dtype=dtype, mode="r", shape=(samples,)), meta["samplerate"]
+
+
+def read_window(audio, start, end):
+    """Samples [start, end) of a raw recording or an AudioBuffer as float32."""
+    if isinstance(audio, AudioBuffer):
+        return audio.view(start, end)
+    window = audio[start:end]
+    if window.dtype == np.int16:
+        return window.astype(np.float32) * (1.0 / INT16_SCALE)
+    return np.array(window, dtype=np.float32)
+
+
+def iter_windows(audio, samplerate, max_seconds):
+    """
+    Yield float32 pieces of at most `max_seconds`, cut at the last pause where possible.
+
+    `audio` is a memmap of a raw recording or an AudioBuffer. Only one piece is
+    materialized at a time, so an hour-long recording is decoded with bounded memory.
+    """
+    max_len = max(1, int(max_seconds * samplerate))
+    pos = 0
+    while pos < len(audio):
+        end = min(len(audio), pos + max_len)
+        window = read_window(audio, pos, end)
+        if end < len(audio):
+            cut = find_last_pause(window, samplerate, settings.get("streaming_pause_ms", 500),
+                                  settings.get("silence_threshold", 0.01))
+            if cut:
+                window = window[:cut]
+        pos += len(window)
+        yield window
+
+
+def create_model():
+    if settings.get("model_backend", "faster_whisper") == "parakeet_tdt":
+        from asr_parakeet import ASRParakeet
+        return ASRParakeet()
+    from asr_whisper import ASRWhisper
+    return ASRWhisper()
+
+
+def transcribe_recording(model, path):
+    audio, samplerate = open_recording(path)
+    logging.info(f"Recovering {path}: {len(audio) / samplerate:.0f}s of audio")
+    parts = []
+    for window in iter_windows(audio, samplerate, settings.get("recover_window_seconds", 120.0)):
+        text = model.transcribe(window)
+        if text:
+            parts.append(text)
+    return " ".join(parts).strip()
+
+
+def run():
+    """Transcribe every unfinished long-form recording; the text is saved next to it as .txt."""
+    paths = pending_recordings()
+    if not paths:
+        print("No unfinished recordings found.")
+        return 0
+
+    model = create_model()
+    model.load()
+    failed = 0
+    for path in paths:
+        try:
+            text = transcribe_recording(model, path)
+        except Exception as e:
+            logging.error(f"Could not recover {path}: {e}")
+            print(f"{path}: FAILED ({e})")
+            failed += 1
+            continue
+
+        transcript = os.path.splitext(path)[0] + ".txt"
+        with open(transcript, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        # The transcript replaces the raw audio
+        os.remove(path)
+        os.remove(path + ".json")
+        print(f"{path} -> {transcript}")
+        print(text)
+    return 1 if failed else 0
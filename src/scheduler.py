@@ -0,0 +1,121 @@
+import logging
+import itertools
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from asr_interface import CancellationToken
+
+
+@dataclass(frozen=True)
+class Job:
+    """One finished recording. Created when recording stops and never mutated afterwards."""
+    seq: int
+    buffer: object # AudioBuffer of this recording only; no longer written to
+    session: object # SessionTimer
+    streamer: object = None # StreamingTranscriber that decoded segments while recording
+    output_mode: str = "clipboard" # Captured at stop, so a settings change can't affect queued jobs
+    incremental: bool = False # Output each decoded segment as soon as it is available
+    cancel_token: CancellationToken = field(default_factory=CancellationToken, compare=False)
+
+
+class SessionScheduler:
+    """
+    Decodes recordings on a bounded worker pool and emits results strictly in session order.
+
+    `decode(job)` runs on one of `max_workers` decode threads and returns the text.
+    `emit(job, text, error)` runs on a single output thread, once per job, in the order
+    the jobs were submitted, even if a later (shorter) recording finishes decoding first.
+    Output (clipboard, paste) therefore never interleaves, and recording the next
+    utterance never waits for the previous one to be decoded.
+
+    Incremental jobs may also report partial text while decoding via `partial()`.
+    `emit_segment(job, text)` runs on the same output thread; segments of a job that
+    is not yet at the head of the queue are held back until every earlier job was
+    emitted, so partial output keeps session order too.
+    """
+
+    def __init__(self, decode, emit, max_workers=1, emit_segment=None):
+        self.decode = decode
+        self.emit = emit
+        self.emit_segment = emit_segment
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="uwhisper-decode")
+        self.output = ThreadPoolExecutor(max_workers=1, thread_name_prefix="uwhisper-output")
+        self.lock = threading.Lock()
+        self.counter = itertools.count()
+        self.next_seq = 0 # Next job to emit
+        self.jobs = {} # seq -> Job submitted but not yet emitted
+        self.done = {} # seq -> (text, error) waiting for earlier jobs to be emitted
+        self.partials = {} # seq -> segments held back until the job reaches the head
+
+    def submit(self, buffer, session, streamer=None, output_mode="clipboard", incremental=False):
+        with self.lock:
+            job = Job(next(self.counter), buffer, session, streamer, output_mode, incremental)
+            self.jobs[job.seq] = job
+        self.executor.submit(self._decode, job)
+        return job
+
+    def partial(self, job, text):
+        """Report a decoded segment of `job` (thread-safe); output happens in session order."""
+        if self.emit_segment:
+            self.output.submit(self._emit_partial, job, text)
+
+    def pending(self):
+        """Number of jobs not yet emitted."""
+        with self.lock:
+            return len(self.jobs)
+
+    def cancel_pending(self):
+        """Cancel every job that has not been emitted; each still emits (as cancelled), in order."""
+        with self.lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            job.cancel_token.cancel()
+            if job.streamer:
+                job.streamer.cancel()
+        return len(jobs)
+
+    def shutdown(self):
+        self.cancel_pending()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.output.shutdown(wait=False, cancel_futures=True)
+
+    def _decode(self, job):
+        text, error = "", None
+        if not job.cancel_token.cancelled:
+            try:
+                text = self.decode(job)
+            except Exception as e:
+                error = e
+        with self.lock:
+            self.done[job.seq] = (text, error)
+        self.output.submit(self._emit_ready)
+
+    def _emit_partial(self, job, text):
+        with self.lock:
+            if job.seq != self.next_seq:
+                self.partials.setdefault(job.seq, []).append(text)
+                return
+        self._call(self.emit_segment, job, text)
+
+    def _emit_ready(self):
+        # Only runs on the output thread, so emission is serialized
+        while True:
+            with self.lock:
+                seq = self.next_seq
+                job = self.jobs.get(seq)
+                held_back = self.partials.pop(seq, [])
+                result = self.done.pop(seq, None)
+                if result is not None:
+                    del self.jobs[seq]
+                    self.next_seq += 1
+            for text in held_back:
+                self._call(self.emit_segment, job, text)
+            if result is None:
+                return
+            self._call(self.emit, job, *result)
+
+    def _call(self, func, job, *args):
+        try:
+            func(job, *args)
+        except Exception as e:
+            logging.error(f"Emitting session {job.seq} failed: {e}")
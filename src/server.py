@@ -1,29 +1,56 @@
 import os
 import logging
-import socket
 import threading
-import queue
 import time
 import subprocess
-import numpy as np
-import sounddevice as sd
 from config_manager import settings
 from config import SOCKET_PATH
 from signals import ServerSignals
+from control import ControlServer
+from audio_buffer import AudioBuffer, PreRollRing
+from capture import CaptureEngine
+from meter import LevelMeter
+import vad
+from metrics import Metrics, SessionTimer
+from scheduler import SessionScheduler
+from model_cache import ModelCache, current_rss_mb, estimate_model_mb
 
 class WhisperServer:
     def __init__(self):
         self.running = True
         self.recording = False
-        self.audio_queue = queue.Queue()
-        self.model = None
+        self.model = None # Active model (also resident in model_cache)
+        self.model_key_loaded = None
+        self.model_cache = ModelCache(settings.get("model_cache_budget_mb", 2048))
         self.samplerate = 16000
-        self.abort_transcription = False
+        self.buffer = self.new_buffer() # Capture buffer of the current recording
+        self.model_lock = threading.RLock()
+        self.streamer = None # StreamingTranscriber of the current recording
+        self.state = "idle"
+        self.start_time = time.monotonic()
+        self.first_ready_time = None # Seconds from startup until the first model was ready
+        self.metrics = Metrics()
+        self.session = None # SessionTimer of the current recording
+        self.first_frame_pending = False
+        self.control = None # ControlServer serving the Unix socket
+        self.last_toggle_time = 0.0
+        # Recordings become jobs: decoded on a bounded pool, output in session order
+        self.scheduler = SessionScheduler(self.decode_job, self.emit_job,
+                                          max_workers=settings.get("decode_workers", 1),
+                                          emit_segment=self.emit_segment)
+        self.delivered = {} # Job seq -> segments already output incrementally (output thread only)
         
         # Signals for GUI
         self.signals = ServerSignals()
         
         self.headless = False
+        self.meter = None # LevelMeter, only enabled when a GUI displays it
+        # While idle only the last moments of audio are kept, to be prepended on START
+        self.preroll = PreRollRing(self.samplerate, settings.get("preroll_ms", 500) / 1000)
+        self.capture_wanted = threading.Event() # Cleared while the input stream is suspended
+        self.capture_wanted.set()
+        self.capture_lock = threading.Lock()
+        self.last_active = time.monotonic()
 
         
         # Ensure socket cleanup
@@ -32,48 +59,141 @@ class WhisperServer:
             os.remove(socket_path)
 
     def load_model(self):
+        # Segments and queued jobs may be decoded from several worker threads that
+        # all request the model, so loading is serialized.
+        with self.model_lock:
+            self._load_model_locked()
+
+    def model_key(self, backend=None):
+        """Identity of a loaded model: (backend, variant/size, device, compute_type)."""
+        backend = backend or settings.get("model_backend", "faster_whisper")
+        if backend == "parakeet_tdt":
+            return (backend, settings.get("parakeet_variant", "v2_en"), "cpu", "int8")
+        return (backend, settings.get("model_size"), settings.get("device"), settings.get("compute_type"))
+
+    def _load_model_locked(self):
         backend = settings.get("model_backend", "faster_whisper")
-        
-        # If model is loaded but backend changed, reset
-        if self.model:
-            current_settings = self.model.get_settings()
-            if current_settings.get("type") != backend:
-                logging.info(f"Switching backend from {current_settings.get('type')} to {backend}")
-                self.model = None
-            elif backend == "parakeet_tdt" and current_settings.get("variant") != settings.get("parakeet_variant"):
-                 logging.info(f"Switching Parakeet variant from {current_settings.get('variant')} to {settings.get('parakeet_variant')}")
-                 self.model = None
-
-        if not self.model:
-            logging.info(f"Initializing backend: {backend}")
-            try:
-                if backend == "faster_whisper":
-                    from asr_whisper import ASRWhisper
-                    self.model = ASRWhisper()
-                elif backend == "parakeet_tdt":
-                    from asr_parakeet import ASRParakeet
-                    self.model = ASRParakeet()
-                else:
-                    logging.error(f"Unknown backend: {backend}")
-                    self.notify("Error", f"Unknown backend: {backend}")
-                    return
-            except ImportError as e:
-                logging.error(f"Failed to import backend {backend}: {e}")
-                self.notify("Error", f"Missing dependencies for {backend}")
+        key = self.model_key(backend)
+
+        if self.model and self.model_key_loaded == key and not self.model.needs_load():
+            return
+
+        # Switching to a model that is still resident is just a pointer swap
+        cached = self.model_cache.get(key)
+        if cached and not cached.needs_load():
+            if self.model is not cached:
+                logging.info(f"Switching to resident model {key}")
+            self.model = cached
+            self.model_key_loaded = key
+            return
+
+        # A resident model whose load options (e.g. thread count) changed is reloaded in place
+        model = cached
+        if model:
+            logging.info(f"Reloading {key} with new options")
+        else:
+            model = self.create_model(backend)
+            if not model:
                 return
 
-        self.signals.state_changed.emit("loading")
+        # While recording the overlay keeps listening; readiness is reported via model_ready
+        previous_state = self.state
+        if not self.recording:
+            self.set_state("loading")
 
 
-        # Load the actual model resources (this might check for settings changes internally)
+        # Load the actual model resources
         try:
-            self.model.load()
-            self.signals.state_changed.emit("transcribing") # Restore state if we were processing
+            rss_before = current_rss_mb()
+            load_start = time.monotonic()
+            model.load()
+            load_time = time.monotonic() - load_start
+
+            if settings.get("model_warmup", True):
+                warmup_start = time.monotonic()
+                model.warmup()
+                logging.info(f"Warm-up decode took {time.monotonic() - warmup_start:.2f}s")
+
+            # Measured footprint includes the allocations made by the warm-up decode
+            size_mb = current_rss_mb() - rss_before
+            if size_mb <= 0:
+                size_mb = estimate_model_mb(key)
+            self.model_cache.put(key, model, size_mb)
+            self.model = model
+            self.model_key_loaded = key
+
+            ready_time = time.monotonic() - load_start
+            if self.first_ready_time is None:
+                self.first_ready_time = time.monotonic() - self.start_time
+                logging.info(f"Time to first ready: {self.first_ready_time:.2f}s after startup")
+            logging.info(f"Model ready (load {load_time:.2f}s, total {ready_time:.2f}s, ~{size_mb:.0f} MiB, "
+                         f"{len(self.model_cache)} resident using {self.model_cache.used_mb:.0f} MiB)")
+            self.metrics.record("model_load", ready_time)
+            self.signals.model_ready.emit(backend, ready_time)
             # self.notify("System", "Model Ready") # Redundant if workflow is correct
         except Exception as e:
 
             logging.error(f"Error loading model: {e}")
             self.notify("Error", f"Model load failed: {e}")
+            self.model = None
+            self.model_key_loaded = None
+
+        if self.state == "loading":
+            self.set_state(previous_state if previous_state != "loading" else "idle")
+
+    def create_model(self, backend):
+        logging.info(f"Initializing backend: {backend}")
+        try:
+            if backend == "faster_whisper":
+                from asr_whisper import ASRWhisper
+                return ASRWhisper()
+            elif backend == "parakeet_tdt":
+                from asr_parakeet import ASRParakeet
+                return ASRParakeet()
+            else:
+                logging.error(f"Unknown backend: {backend}")
+                self.notify("Error", f"Unknown backend: {backend}")
+        except ImportError as e:
+            logging.error(f"Failed to import backend {backend}: {e}")
+            self.notify("Error", f"Missing dependencies for {backend}")
+        return None
+
+    def enable_metering(self):
+        """Compute input levels for display (the GUI polls the returned meter)."""
+        if not self.meter:
+            self.meter = LevelMeter(self.samplerate, settings.get("meter_rate_hz", 30))
+        return self.meter
+
+    def new_buffer(self, longform=False):
+        chunk_seconds = settings.get("capture_chunk_seconds", 60.0)
+        spill_path = None
+        memory_chunks = 1
+        if longform:
+            # Long-form: completed chunks go to disk, only a window of them stays in RAM
+            import recovery
+            spill_path = os.path.join(recovery.recordings_dir(),
+                                      time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}.raw")
+            memory_chunks = max(1, round(settings.get("longform_memory_seconds", 300) / chunk_seconds))
+        return AudioBuffer(self.samplerate, chunk_seconds=chunk_seconds,
+                           dtype=settings.get("capture_dtype", "float32"),
+                           spill_path=spill_path, memory_chunks=memory_chunks)
+
+    def get_loaded_model(self):
+        """Load the model if needed and return it (None if loading failed)."""
+        self.load_model()
+        return self.model
+
+    def preload_model(self):
+        """Load the model in a background thread so it overlaps with recording."""
+        threading.Thread(target=self.load_model, daemon=True).start()
+
+    def is_model_ready(self):
+        model = self.model
+        return model is not None and self.model_key_loaded == self.model_key() and not model.needs_load()
+
+    def set_state(self, state):
+        self.state = state
+        self.signals.state_changed.emit(state)
 
     def notify(self, title, message):
         # Emit signal for GUI Overlay
@@ -93,22 +213,20 @@ class WhisperServer:
         except Exception as e:
             logging.error(f"Clipboard error: {e}")
 
-    def audio_callback(self, indata, frames, time, status):
-        # if status:
-        #     print(f"Audio status: {status}")
+    def on_audio(self, indata):
+        """Receives every captured 16 kHz block (on the capture worker thread)."""
         if self.recording:
-            self.audio_queue.put(indata.copy())
+            if self.first_frame_pending:
+                self.first_frame_pending = False
+                # Speech that started just before the hotkey press comes first
+                self.preroll.drain_into(self.buffer)
+                self.session.mark("first_frame")
+            self.buffer.write(indata)
             
-            # Calculate Amplitude (RMS) for Visualization
-            rms = np.sqrt(np.mean(indata**2))
-            # Normalize reasonably (voice is usually low amplitude)
-            # typical values 0.01 - 0.2, boost it for visuals
-            level = min(rms * 10, 1.0)
-            try:
-                self.signals.amplitude_changed.emit(level)
-            except RuntimeError:
-                # App is shutting down, signal object deleted
-                pass
+            if self.meter:
+                self.meter.process(indata)
+        else:
+            self.preroll.write(indata)
 
     def get_downloaded_models(self):
         """Check standard HF cache for faster-whisper models"""
@@ -159,24 +277,20 @@ class WhisperServer:
             return False
 
     def download_model(self, model_size):
-        """Download model in a blocking way (run in thread)"""
+        """Download model in a blocking way (run in thread); progress goes to signals.download_progress"""
         backend = settings.get("model_backend", "faster_whisper")
         
         try:
             logging.info(f"Downloading {model_size} for {backend}...")
+            on_progress = self.signals.download_progress.emit
             
             if backend == "faster_whisper":
-                from faster_whisper import download_model
-                download_model(model_size)
+                from asr_whisper import ASRWhisper
+                ASRWhisper.download(model_size, on_progress)
             elif backend == "parakeet_tdt":
-                # For Parakeet, 'load()' triggers the download of the configured repo
+                # Parakeet downloads the configured variant; nothing is loaded into memory
                 from asr_parakeet import ASRParakeet
-                # We instantiate and load. This might load into memory which is heavy 
-                # just for a "download" button, but it ensures files are there.
-                # A better way would be exposing only _download_model_if_needed 
-                # but that is private. For now, full load is acceptable as verification.
-                temp_model = ASRParakeet()
-                temp_model.load() 
+                ASRParakeet.download(settings.get("parakeet_variant", "v2_en"), on_progress)
                 
             logging.info("Download complete.")
             return True
@@ -185,140 +299,325 @@ class WhisperServer:
             return False
 
     def record_loop(self):
-        with sd.InputStream(samplerate=self.samplerate, channels=1, callback=self.audio_callback):
-            while self.running:
-                time.sleep(0.1)
+        failures = 0 # Consecutive failed attempts to open/run the input stream
+        while self.running:
+            # Suspended after a long idle period until the next recording starts
+            if not self.capture_wanted.wait(timeout=0.5):
+                continue
+            try:
+                engine = CaptureEngine(self.on_audio, self.metrics, self.samplerate)
+                with engine:
+                    if failures:
+                        logging.info("Audio capture recovered.")
+                        failures = 0
+                    while self.running and not self.idle_expired():
+                        # Device/latency changes apply as soon as we're not recording
+                        if not self.recording and engine.options_changed():
+                            logging.info("Capture settings changed; reopening the input stream.")
+                            break
+                        time.sleep(0.1)
+            except Exception as e:
+                failures += 1
+                if failures == 1:
+                    # Once per failure streak, not on every retry
+                    logging.error(f"Audio capture error: {e}")
+                    self.notify("Error", f"Audio capture failed: {e}")
+                else:
+                    logging.debug(f"Audio capture still failing ({failures} attempts): {e}")
+                # Back off 2s, 4s, 8s ... up to 30s so a missing device doesn't keep us busy
+                retry_at = time.monotonic() + min(30.0, 2.0 * 2 ** (failures - 1))
+                while self.running and time.monotonic() < retry_at:
+                    time.sleep(0.25)
+            # Stale audio must not be prepended once capture resumes
+            self.preroll.clear()
+
+    def idle_expired(self):
+        """True (and capture is marked unwanted) once nothing was recorded for idle_suspend_seconds."""
+        idle_limit = settings.get("idle_suspend_seconds", 0)
+        if idle_limit <= 0:
+            return False
+        with self.capture_lock:
+            if self.recording or time.monotonic() - self.last_active < idle_limit:
+                return False
+            self.capture_wanted.clear()
+        logging.info(f"No recording for {idle_limit}s; suspending audio capture.")
+        return True
+
+    def wake_capture(self):
+        with self.capture_lock:
+            self.last_active = time.monotonic()
+            self.capture_wanted.set()
 
     def cancel_recording(self):
+        """Discard the current recording, or if not recording, every queued transcription."""
         logging.info("Cancellation requested.")
-        self.recording = False
-        self.abort_transcription = True
-        # Clear queue
-        with self.audio_queue.mutex:
-            self.audio_queue.queue.clear()
-        self.signals.state_changed.emit("idle")
-
-    def process_audio(self):
-        if self.abort_transcription:
-            logging.info("Transcription aborted.")
-            self.abort_transcription = False
-            self.signals.state_changed.emit("idle")
-            return
+        if self.recording:
+            self.recording = False
+            if self.streamer:
+                self.streamer.cancel()
+                self.streamer = None
+            self.buffer.clear()
+        else:
+            cancelled = self.scheduler.cancel_pending()
+            if cancelled:
+                logging.info(f"Cancelled {cancelled} pending transcription(s).")
+        self.settle_state()
 
-        self.signals.state_changed.emit("transcribing")
-        
-        audio_data = []
-        while not self.audio_queue.empty():
-            audio_data.append(self.audio_queue.get())
-        
-        if not audio_data:
-            self.signals.state_changed.emit("idle")
-            return
+    def settle_state(self):
+        """After a recording or job ends: keep transcribing while jobs are queued, else go idle."""
+        if not self.recording:
+            self.set_state("transcribing" if self.scheduler.pending() else "idle")
+
+    def decode_job(self, job):
+        """Runs on a scheduler worker: VAD, model load and decode. Returns the text ('' if none)."""
+        session = job.session
+        on_segment = None
+        if job.incremental:
+            on_segment = lambda text: self.scheduler.partial(job, text)
+
+        if job.streamer:
+            # Earlier segments were decoded while recording; only the tail is left
+            session.mark("assembled")
+            logging.info("Transcribing trailing segment...")
+            decode_start = time.perf_counter()
+            text = job.streamer.finish(on_segment=on_segment)
+            self.metrics.record("decode", time.perf_counter() - decode_start)
+            return text or ""
+
+        if len(job.buffer) == 0:
+            return ""
+        if job.buffer.spill_path and job.buffer.duration > settings.get("recover_window_seconds", 120.0):
+            # Long-form recordings live mostly on disk; everything else is decoded whole
+            # so the backend's own long-audio handling (overlap merge, batching) applies
+            return self.decode_windows(job, on_segment)
+
+        # Zero-copy for recordings that fit in one chunk
+        audio_np = job.buffer.view()
 
-        audio_np = np.concatenate(audio_data, axis=0)
-        audio_np = audio_np.flatten().astype(np.float32)
+        # Trim silence before the backend ever sees the audio
+        speech = vad.gate(audio_np, self.samplerate)
+        if len(speech) == 0:
+            logging.info("No speech detected by VAD; skipping transcription.")
+            return ""
+        if len(speech) < len(audio_np):
+            logging.info(f"VAD trimmed {len(audio_np) / self.samplerate:.1f}s to {len(speech) / self.samplerate:.1f}s")
+        session.mark("assembled")
 
         logging.info("Transcribing...")
-        
-        self.load_model() # Check if model needs loading/reloading
-        
-        if not self.model:
-             logging.error("No model available")
-             self.signals.state_changed.emit("idle")
-             return
+        load_start = time.perf_counter()
+        model = self.get_loaded_model() # Check if model needs loading/reloading
+        self.metrics.record("load", time.perf_counter() - load_start)
+        if not model:
+            raise RuntimeError("no model available")
 
-        try:
-            text = self.model.transcribe(audio_np)
-            
-            if self.abort_transcription:
-                self.abort_transcription = False
-                self.signals.state_changed.emit("idle")
-                return
+        decode_start = time.perf_counter()
+        text = model.transcribe(speech, cancel=job.cancel_token, on_segment=on_segment)
+        self.metrics.record("decode", time.perf_counter() - decode_start)
+        return text
 
+    def decode_windows(self, job, on_segment=None):
+        """Decode a long recording in pieces cut at pauses, never assembling all of it in memory."""
+        import recovery
+        job.session.mark("assembled")
+        logging.info(f"Transcribing {job.buffer.duration:.0f}s in windows...")
+        load_start = time.perf_counter()
+        model = self.get_loaded_model()
+        self.metrics.record("load", time.perf_counter() - load_start)
+        if not model:
+            raise RuntimeError("no model available")
+
+        decode_start = time.perf_counter()
+        parts = []
+        for window in recovery.iter_windows(job.buffer, self.samplerate, settings.get("recover_window_seconds", 120.0)):
+            job.cancel_token.check()
+            speech = vad.gate(window, self.samplerate)
+            if len(speech) == 0:
+                continue
+            emitted = []
+            def on_window_segment(text):
+                emitted.append(text)
+                on_segment(text)
+            text = model.transcribe(speech, cancel=job.cancel_token,
+                                    on_segment=on_window_segment if on_segment else None)
             if text:
-                logging.info(f"Transcription: {text}")
+                parts.append(text)
+                # Backends may skip on_segment; every window still goes out as it finishes
+                if on_segment and not emitted:
+                    on_segment(text)
+        self.metrics.record("decode", time.perf_counter() - decode_start)
+        return " ".join(parts).strip()
+
+    def emit_segment(self, job, text):
+        """Runs on the scheduler's output thread: output one segment of an incremental job."""
+        if job.cancel_token.cancelled:
+            return
+        delivered = self.delivered.setdefault(job.seq, [])
+        piece = f" {text}" if delivered else text
+        delivered.append(text)
+        if len(delivered) == 1:
+            job.session.mark("first_output")
+
+        if job.output_mode == "paste":
+            # The GUI pastes pieces itself (after releasing focus) on segment_ready
+            if self.headless:
+                from input_simulator import simulate_ctrl_v
+                self.copy_to_clipboard(piece)
+                if not simulate_ctrl_v():
+                    self.notify("Paste Failed", "Input simulation failed.")
+        else:
+            # The clipboard always holds everything decoded so far
+            self.copy_to_clipboard(" ".join(delivered))
+        self.signals.segment_ready.emit(piece)
+
+    def emit_job(self, job, text, error):
+        """Runs on the scheduler's output thread, in session order: clipboard, paste, reply."""
+        session = job.session
+        # With incremental output, all of the text was already delivered segment by segment
+        delivered = self.delivered.pop(job.seq, None)
+        if job.cancel_token.cancelled:
+            logging.info("Transcription aborted.")
+            result = "CANCELLED"
+        elif error:
+            logging.error(f"Transcription error: {error}")
+            self.notify("Error", f"Transcription failed: {error}")
+            result = f"ERR {error}"
+        elif text:
+            # Newlines would break the line-based control protocol
+            result = "TEXT " + " ".join(text.splitlines())
+            logging.info(f"Transcription: {text}")
+            clipboard_start = time.perf_counter()
+            # After incremental output only a headless paste left a partial clipboard
+            # (the GUI restores the full text itself once its pastes are done)
+            if not delivered or (job.output_mode == "paste" and self.headless):
                 self.copy_to_clipboard(text)
-                self.signals.text_ready.emit(text)
-                
-                # Check output mode
-                mode = settings.get("output_mode")
-                if mode == "paste":
-                     # If headless, we need to handle paste here (blindly)
-                     if self.headless:
-                         from input_simulator import simulate_ctrl_v
-                         time.sleep(0.5) # Slight safety delay for headless
-                         if not simulate_ctrl_v():
-                             self.notify("Paste Failed", "Input simulation failed.")
-                     else:
-                         # GUI mode: Let GUI handle the pasting after hiding overlay to manage focus
-                         pass 
-
-                # self.notify("Transcription Complete", f"Copied: {text}")
-            else:
-                self.notify("Status", "No speech detected.")
-                
-        except Exception as e:
-            logging.error(f"Transcription error: {e}")
-            self.notify("Error", f"Transcription failed: {e}")
-            
-        self.signals.state_changed.emit("idle")
+            session.mark("clipboard_done")
+            self.metrics.record("clipboard", time.perf_counter() - clipboard_start)
+            self.signals.text_ready.emit(text)
 
-    def handle_client(self, conn):
-        try:
-            data = conn.recv(1024).decode().strip()
-            if data == "TOGGLE":
-                current_time = time.time()
-                # 500ms debounce
-                if hasattr(self, 'last_toggle_time') and (current_time - self.last_toggle_time < 0.5):
-                    logging.debug("Debounced toggle request.")
-                    return
-
-                self.last_toggle_time = current_time
-
-                if self.recording:
-                    logging.info("Stopping recording...")
-                    self.recording = False
-                    # self.notify("uWhisper", "Processing...")
-                    # Overlay handles "Processing" state
-                    threading.Thread(target=self.process_audio).start()
-                else:
-                    logging.info("Starting recording...")
-                    self.abort_transcription = False
-                    with self.audio_queue.mutex:
-                        self.audio_queue.queue.clear()
-                    self.recording = True
-                    self.signals.state_changed.emit("recording")
-                    # self.notify("uWhisper", "Recording started...")
-                    # Overlay handles "Recording" state
-        except Exception as e:
-            logging.error(f"Socket error: {e}")
-        finally:
-            conn.close()
+            # GUI mode: the GUI pastes after hiding the overlay to manage focus.
+            # Headless we have to paste here (blindly).
+            if job.output_mode == "paste" and self.headless and not delivered:
+                from input_simulator import simulate_ctrl_v
+                time.sleep(0.5) # Slight safety delay for headless
+                paste_start = time.perf_counter()
+                if not simulate_ctrl_v():
+                    self.notify("Paste Failed", "Input simulation failed.")
+                self.metrics.record("paste", time.perf_counter() - paste_start)
+        else:
+            self.notify("Status", "No speech detected.")
+            result = "EMPTY"
+
+        # Every outcome counts: slow or failed dictations are the ones worth diagnosing
+        self.metrics.record_session(session)
+        if error and not job.cancel_token.cancelled:
+            # Keep a long-form copy on disk so --recover can still transcribe it
+            job.buffer.close()
+        else:
+            # The recording is handled; a long-form copy on disk is no longer needed
+            job.buffer.discard()
+        self.settle_state()
+        # Clients that stopped this recording get the outcome on their connection
+        if self.control:
+            self.control.publish(session, result)
+
+    def start_recording(self):
+        if self.recording:
+            return False
+        logging.info("Starting recording...")
+        self.session = SessionTimer()
+        self.wake_capture() # Resumes a suspended input stream
+        self.first_frame_pending = True
+        if self.meter:
+            self.meter.reset()
+        # Fresh buffer per recording: jobs still decoding earlier recordings keep their own
+        self.buffer = self.new_buffer(longform=settings.get("longform_spill", False))
+        self.recording = True
+        if settings.get("model_load_policy", "on_record") == "on_record" and not self.is_model_ready():
+            # Load while the user is speaking instead of after they stop
+            self.preload_model()
+        if settings.get("streaming_decode", True):
+            from streaming import StreamingTranscriber
+            self.streamer = StreamingTranscriber(self.buffer, self.get_loaded_model)
+            self.streamer.start()
+        self.set_state("recording")
+        # Overlay handles "Recording" state
+        return True
+
+    def stop_recording(self):
+        """Stop recording and queue it for transcription; returns the session (None if not recording)."""
+        if not self.recording:
+            return None
+        logging.info("Stopping recording...")
+        self.recording = False
+        self.last_active = time.monotonic()
+        session = self.session
+        session.mark("stop")
+        # A long-form recording is complete on disk from here on, even if decoding crashes
+        self.buffer.finalize()
+        streamer, self.streamer = self.streamer, None
+        self.scheduler.submit(self.buffer, session, streamer, settings.get("output_mode"),
+                              incremental=settings.get("incremental_output", False))
+        # Overlay handles "Processing" state
+        self.set_state("transcribing")
+        return session
+
+    def handle_command(self, verb):
+        """
+        Execute a control command. Returns (reply, session) where session is set when
+        the command stopped a recording and the caller should receive its result.
+        """
+        if verb == "PING":
+            return "PONG", None
+        if verb == "START":
+            return ("OK RECORDING" if self.start_recording() else "OK ALREADY_RECORDING"), None
+        if verb == "STOP":
+            session = self.stop_recording()
+            return ("OK STOPPED" if session else "ERR not recording"), session
+        if verb == "CANCEL":
+            self.cancel_recording()
+            return "OK CANCELLED", None
+        if verb == "STATUS":
+            return f"OK {self.state} model={'ready' if self.is_model_ready() else 'not_loaded'}", None
+        if verb == "STATS":
+            report = self.metrics.format()
+            # <n> counts the newline the control server appends, so the frame ends exactly there
+            return f"OK STATS {len(report.encode()) + 1}\n{report}", None
+        if verb == "TOGGLE":
+            current_time = time.time()
+            # 500ms debounce (explicit START/STOP bypass it)
+            if current_time - self.last_toggle_time < 0.5:
+                logging.debug("Debounced toggle request.")
+                return "OK DEBOUNCED", None
+            self.last_toggle_time = current_time
+
+            if self.recording:
+                return "OK STOPPED", self.stop_recording()
+            self.start_recording()
+            return "OK RECORDING", None
+        return f"ERR unknown command {verb}", None
 
     def start(self):
-        # self.load_model() # Lazy load on first transcribe? Or preload?
-        # Let's preload if configured, otherwise wait
-        # self.load_model()
+        # Preload if configured; "on_record" loads when recording starts, "lazy" on first transcribe
+        if settings.get("model_load_policy", "on_record") == "startup":
+            self.preload_model()
         
         threading.Thread(target=self.record_loop, daemon=True).start()
 
-        socket_path = SOCKET_PATH
-        server_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        server_sock.bind(socket_path)
-        server_sock.listen(1)
-        
-        # print(f"Listening on {socket_path}")
-        
+        import recovery
+        leftovers = recovery.pending_recordings()
+        if leftovers:
+            logging.warning(f"{len(leftovers)} unfinished long-form recording(s) in {recovery.recordings_dir()}; "
+                            "run with --recover to transcribe them.")
+            self.notify("Recovery", f"{len(leftovers)} unfinished recording(s) found. Run uwhisper --recover.")
+
+        self.control = ControlServer(self, SOCKET_PATH)
         try:
-            while self.running:
-                conn, _ = server_sock.accept()
-                self.handle_client(conn)
+            self.control.serve()
         except Exception as e:
             logging.error(f"Server error: {e}")
         finally:
             self.running = False
-            if os.path.exists(socket_path):
-                os.remove(socket_path)
     
     def stop(self):
         self.running = False
+        self.scheduler.shutdown()
@@ -2,8 +2,10 @@ from PyQt6.QtCore import QObject, pyqtSignal
 
 class ServerSignals(QObject):
     state_changed = pyqtSignal(str) # "recording", "transcribing", "idle", "error", "loading"
-    amplitude_changed = pyqtSignal(float) # 0.0 to 1.0
     text_ready = pyqtSignal(str) # The transcribed text (optional usage)
+    segment_ready = pyqtSignal(str) # Incremental output: next piece of text (leading space if not first)
     notification = pyqtSignal(str, str) # title, message
     cancel_requested = pyqtSignal()
+    model_ready = pyqtSignal(str, float) # backend, seconds spent loading + warming up
+    download_progress = pyqtSignal(object, object) # bytes done, bytes total (may exceed a 32-bit int)
 
@@ -0,0 +1,160 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config_manager import settings
+import numpy as np
+from vad import FRAME_MS, adaptive_threshold, frame_rms, gate
+from asr_interface import CancellationToken
+
+
+class StreamingTranscriber:
+    """
+    Decodes finished speech segments in the background while recording continues.
+
+    The capture buffer is watched while the user is still speaking. Whenever enough
+    uncommitted audio has accumulated and it contains a natural pause, everything
+    up to the pause is handed to the ASR model on a worker thread; without a pause
+    a segment is cut hard at `streaming_max_segment_seconds`. On stop only the
+    trailing tail has to be decoded, so the stop-to-text latency no longer grows with
+    the length of the dictation.
+
+    Each poll only analyzes the frames that arrived since the last one. Silence is
+    judged against the noise floor of recent audio (as in vad.trim_silence), so
+    pauses are still found in a room that is louder than `silence_threshold`.
+    """
+
+    def __init__(self, buffer, get_model):
+        self.buffer = buffer # AudioBuffer of the current recording
+        self.get_model = get_model # Callable returning a loaded ASRModel (or None)
+        self.samplerate = buffer.samplerate
+
+        self.min_segment = int(settings.get("streaming_min_segment_seconds", 5.0) * self.samplerate)
+        self.max_segment = max(self.min_segment,
+                               int(settings.get("streaming_max_segment_seconds", 30.0) * self.samplerate))
+        self.pause_frames = max(1, int(settings.get("streaming_pause_ms", 500) / FRAME_MS))
+        self.silence_threshold = settings.get("silence_threshold", 0.01)
+
+        # Incremental pause search state
+        self.frame_len = int(self.samplerate * FRAME_MS / 1000)
+        self.scanned = 0 # Buffer position up to which whole frames were analyzed
+        self.levels = np.zeros(0, dtype=np.float32) # RMS of recent frames, for the noise floor
+        self.noise_frames = int(30_000 / FRAME_MS) # Noise floor window: the last 30s
+        self.silent_run = 0 # Consecutive silent frames up to `scanned`
+        self.last_pause = 0 # Cut point in the middle of the latest pause found
+        self.last_pause_start = -1 # Where that pause window starts (must lie after `committed`)
+
+        self.committed = 0 # Buffer position up to which audio was handed to the decoder
+        self.futures = [] # Decoded segment texts, in recording order
+
+        # A single worker keeps segments (and the model) strictly serialized
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="uwhisper-segment")
+        self.stop_event = threading.Event()
+        self.cancel_token = CancellationToken() # Also stops a segment that is mid-decode
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        while not self.stop_event.wait(0.25):
+            try:
+                self._maybe_commit()
+            except Exception as e:
+                logging.error(f"Streaming segmentation error: {e}")
+
+    def _scan(self, end):
+        """Analyze the whole frames in [scanned, end) and remember the latest pause."""
+        frames = (end - self.scanned) // self.frame_len
+        if frames == 0:
+            return
+        rms = frame_rms(self.buffer.view(self.scanned, self.scanned + frames * self.frame_len),
+                        self.samplerate, FRAME_MS)
+        self.levels = np.concatenate((self.levels, rms))[-self.noise_frames:]
+        threshold = adaptive_threshold(self.levels, self.silence_threshold)
+
+        first_frame = self.scanned // self.frame_len
+        for i, silent in enumerate(rms < threshold):
+            self.silent_run = self.silent_run + 1 if silent else 0
+            if self.silent_run >= self.pause_frames:
+                # Middle of the latest fully silent window of pause_frames (as vad.find_last_pause)
+                self.last_pause_start = (first_frame + i - self.pause_frames + 1) * self.frame_len
+                self.last_pause = self.last_pause_start + (self.pause_frames * self.frame_len) // 2
+        self.scanned += frames * self.frame_len
+
+    def _maybe_commit(self):
+        end = len(self.buffer)
+        self._scan(end)
+        if end - self.committed < self.min_segment:
+            return
+
+        if self.last_pause_start >= self.committed:
+            cut = self.last_pause
+        elif end - self.committed >= self.max_segment:
+            # No pause in a long stretch of speech (or constant noise): cut hard
+            cut = self.committed + self.max_segment
+        else:
+            return
+
+        segment = self.buffer.view(self.committed, cut)
+        self.committed = cut
+        # The rest of the pause just used must not end another (empty) segment
+        self.silent_run = 0
+
+        logging.info(f"Committing segment of {len(segment) / self.samplerate:.1f}s for background decoding")
+        self.futures.append(self.executor.submit(self._decode, segment))
+
+    def _decode(self, segment, on_segment=None):
+        if self.cancel_token.cancelled:
+            return ""
+        # Silent segments never reach (or load) the model
+        segment = gate(segment, self.samplerate)
+        if len(segment) == 0:
+            return ""
+        model = self.get_model()
+        if not model:
+            raise RuntimeError("No model available")
+        return model.transcribe(segment, cancel=self.cancel_token, on_segment=on_segment)
+
+    def finish(self, on_segment=None):
+        """
+        Stop segmentation, decode the trailing tail and return the stitched text.
+
+        `on_segment` receives the text of every finished segment in order, as soon
+        as it is available, followed by the pieces of the tail.
+        """
+        self.stop_event.set()
+        self.thread.join()
+
+        tail = self.buffer.view(self.committed)
+        self.committed += len(tail)
+
+        if not self.futures and len(tail) == 0:
+            self.executor.shutdown(wait=False)
+            return None # Nothing was recorded
+
+        parts = []
+        for future in self.futures:
+            part = future.result()
+            parts.append(part)
+            if part and on_segment:
+                on_segment(part)
+        self.executor.shutdown(wait=False)
+
+        # Every earlier segment is done, so the tail is decoded right here
+        if len(tail) > 0:
+            emitted = []
+            def on_tail_segment(text):
+                emitted.append(text)
+                on_segment(text)
+            tail_text = self._decode(tail, on_tail_segment if on_segment else None)
+            parts.append(tail_text)
+            # Backends may skip on_segment (e.g. Parakeet's short path); the tail must still go out
+            if on_segment and tail_text and not emitted:
+                on_segment(tail_text)
+        return " ".join(p for p in parts if p).strip()
+
+    def cancel(self):
+        """Discard all pending and queued work."""
+        self.cancel_token.cancel()
+        self.stop_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
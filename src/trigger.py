@@ -0,0 +1,37 @@
+#!/usr/bin/python3 -IS
+"""
+Minimal hotkey trigger for uWhisper.
+
+Sends one control command (default TOGGLE) to the running server and exits
+without waiting for the reply. Only builtin modules are used (`_socket` and
+`posix`, which the interpreter has already loaded) so that Python startup, not
+this script, dominates hotkey-to-recording latency; `import socket` alone would
+roughly double the run time by pulling in enum and selectors. Don't add imports
+here; use main.py for anything that needs settings or logging.
+
+Usage: uwhisper-trigger [TOGGLE|START|STOP|CANCEL]
+"""
+import sys
+import posix
+import _socket
+
+# Same default and override as config.SOCKET_PATH
+SOCKET_PATH = posix.environ.get(b"UWHISPER_SOCKET", b"/tmp/uwhisper.sock").decode()
+
+
+def main(argv):
+    command = argv[0].upper() if argv else "TOGGLE"
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.connect(SOCKET_PATH)
+        sock.sendall(command.encode() + b"\n")
+    except OSError as e:
+        sys.stderr.write(f"uwhisper-trigger: server not reachable at {SOCKET_PATH}: {e}\n")
+        return 1
+    finally:
+        sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,159 @@
+import os
+import time
+import logging
+import statistics
+from contextlib import contextmanager
+import numpy as np
+from config_manager import settings
+
+SAMPLERATE = 16000
+WHISPER_COMPUTE_TYPES = ["int8", "int8_float32", "float32"]
+
+
+def synthetic_clip(seconds=10.0):
+    """
+    Deterministic speech-like test signal: voiced bursts (harmonics with a
+    syllable-rate envelope) separated by short pauses.
+    """
+    t = np.arange(int(seconds * SAMPLERATE)) / SAMPLERATE
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLERATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 3.0 * t), 0, None) * (np.sin(2 * np.pi * 0.25 * t) > -0.5)
+    noise = np.random.default_rng(0).standard_normal(len(t)) * 0.005
+    return (0.1 * voiced * envelope + noise).astype(np.float32)
+
+
+def load_clip(path):
+    """Read a local WAV/FLAC file as mono 16 kHz float32."""
+    import soundfile as sf
+    audio, rate = sf.read(path, dtype="float32", always_2d=True)
+    audio = audio.mean(axis=1)
+    if rate != SAMPLERATE:
+        # Linear interpolation is good enough for timing purposes
+        n_out = int(len(audio) * SAMPLERATE / rate)
+        audio = np.interp(np.linspace(0, len(audio) - 1, n_out), np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+def thread_candidates():
+    cores = os.cpu_count() or 4
+    candidates = {cores}
+    n = 1
+    while n < cores:
+        candidates.add(n)
+        n *= 2
+    return sorted(candidates)
+
+
+@contextmanager
+def override_settings(**values):
+    """Temporarily override settings in memory (nothing is written to config.json)."""
+    saved = {key: settings.config.get(key) for key in values}
+    missing = [key for key in values if key not in settings.config]
+    settings.config.update(values)
+    try:
+        yield
+    finally:
+        settings.config.update(saved)
+        for key in missing:
+            settings.config.pop(key, None)
+
+
+def measure(model_factory, clip, repeats=3):
+    """Load a fresh model and decode `clip`; returns (load_seconds, median real-time factor)."""
+    start = time.monotonic()
+    model = model_factory()
+    model.load()
+    load_time = time.monotonic() - start
+
+    model.warmup()
+    timings = []
+    for _ in range(repeats):
+        start = time.monotonic()
+        model.transcribe(clip)
+        timings.append(time.monotonic() - start)
+    rtf = statistics.median(timings) / (len(clip) / SAMPLERATE)
+    return load_time, rtf
+
+
+def whisper_installed(size):
+    cache_dir = os.path.expanduser(f"~/.cache/huggingface/hub/models--Systran--faster-whisper-{size}")
+    return os.path.isdir(cache_dir)
+
+
+def tune_whisper(clip):
+    from asr_whisper import ASRWhisper
+
+    # Candidates are benchmarked on the CPU; their compute types don't carry over to a GPU
+    device = settings.get("device", "cpu")
+    if device != "cpu":
+        print(f"faster_whisper: configured for device '{device}', CPU tuning does not apply, skipping.")
+        return None
+
+    size = settings.get("model_size")
+    if not whisper_installed(size):
+        print(f"faster_whisper: model '{size}' not downloaded, skipping.")
+        return None
+
+    results = []
+    for compute_type in WHISPER_COMPUTE_TYPES:
+        for threads in thread_candidates():
+            overrides = {"compute_type": compute_type, "whisper_cpu_threads": threads, "device": "cpu"}
+            try:
+                with override_settings(**overrides):
+                    load_time, rtf = measure(ASRWhisper, clip)
+            except Exception as e:
+                print(f"faster_whisper {compute_type:>13} threads={threads:<3} failed: {e}")
+                continue
+            print(f"faster_whisper {compute_type:>13} threads={threads:<3} load={load_time:6.2f}s RTF={rtf:.3f}")
+            results.append((rtf, load_time, overrides))
+    return results
+
+
+def tune_parakeet(clip):
+    from asr_parakeet import ASRParakeet
+
+    variant = settings.get("parakeet_variant", "v2_en")
+    if not ASRParakeet.is_installed(variant):
+        print(f"parakeet_tdt: variant '{variant}' not downloaded, skipping.")
+        return None
+
+    # Only the int8 ONNX export is downloaded, so threads are the only knob
+    results = []
+    for threads in thread_candidates():
+        overrides = {"parakeet_num_threads": threads}
+        try:
+            with override_settings(**overrides):
+                load_time, rtf = measure(ASRParakeet, clip)
+        except Exception as e:
+            print(f"parakeet_tdt threads={threads:<3} failed: {e}")
+            continue
+        print(f"parakeet_tdt threads={threads:<3} load={load_time:6.2f}s RTF={rtf:.3f}")
+        results.append((rtf, load_time, overrides))
+    return results
+
+
+def run(clip_path=None):
+    """Benchmark every installed backend and persist the fastest configuration per backend."""
+    clip = load_clip(clip_path) if clip_path else synthetic_clip()
+    print(f"Tuning on {len(clip) / SAMPLERATE:.1f}s clip, {os.cpu_count()} CPU cores")
+
+    tuners = {"faster_whisper": tune_whisper, "parakeet_tdt": tune_parakeet}
+    for backend, tune in tuners.items():
+        try:
+            results = tune(clip)
+        except ImportError as e:
+            print(f"{backend}: not installed ({e}), skipping.")
+            continue
+        if not results:
+            continue
+
+        # Lowest real-time factor wins; load time breaks ties
+        rtf, load_time, best = min(results, key=lambda r: (round(r[0], 3), r[1]))
+        print(f"{backend}: best {best} (RTF={rtf:.3f}, load={load_time:.2f}s)")
+        for key, value in best.items():
+            if key == "device":
+                continue
+            settings.set(key, value)
+        logging.info(f"Tuned {backend}: {best}")
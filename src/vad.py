@@ -0,0 +1,157 @@
+import numpy as np
+from config_manager import settings
+
+FRAME_MS = 30 # Analysis frame length for energy-based voice activity detection
+DEFAULT_THRESHOLD = 0.01 # RMS below this is considered silence (float32 audio in [-1, 1])
+
+
+def frame_rms(audio: np.ndarray, samplerate: int = 16000, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """
+    Compute the RMS level of consecutive, non-overlapping frames.
+
+    Trailing samples that do not fill a whole frame are ignored.
+    """
+    frame_len = int(samplerate * frame_ms / 1000)
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    # einsum avoids materializing frames**2
+    energy = np.einsum('ij,ij->i', frames, frames) / frame_len
+    return np.sqrt(energy)
+
+
+def adaptive_threshold(rms: np.ndarray, threshold: float = DEFAULT_THRESHOLD) -> float:
+    """
+    Silence threshold adapted to the noise floor (quiet frames of `rms`); speech must
+    stand out from it. Capped so audio that is speech throughout doesn't raise the
+    bar to speech level.
+    """
+    if len(rms) == 0:
+        return threshold
+    noise_floor = np.percentile(rms, 10)
+    return max(threshold, min(noise_floor * 3.0, threshold * 5.0))
+
+
+def find_last_pause(audio: np.ndarray, samplerate: int = 16000, min_silence_ms: int = 500,
+                    threshold: float = DEFAULT_THRESHOLD, frame_ms: int = FRAME_MS):
+    """
+    Find the last pause of at least `min_silence_ms` in `audio`.
+
+    Returns the sample index in the middle of that pause (a safe place to cut),
+    or None if the audio contains no such pause.
+    """
+    rms = frame_rms(audio, samplerate, frame_ms)
+    min_frames = max(1, int(min_silence_ms / frame_ms))
+    if len(rms) < min_frames:
+        return None
+
+    silent = rms < threshold
+    # Number of silent frames in every window of `min_frames` consecutive frames
+    counts = np.convolve(silent.astype(np.int32), np.ones(min_frames, dtype=np.int32), mode='valid')
+    full = np.flatnonzero(counts == min_frames)
+    if len(full) == 0:
+        return None
+
+    # Window start of the last fully silent window; cut in its middle
+    start_frame = full[-1]
+    frame_len = int(samplerate * frame_ms / 1000)
+    return (start_frame * frame_len) + (min_frames * frame_len) // 2
+
+
+def split_on_silence(audio: np.ndarray, samplerate: int = 16000, max_segment_s: float = 15.0,
+                     min_silence_ms: int = 300, threshold: float = DEFAULT_THRESHOLD,
+                     frame_ms: int = FRAME_MS):
+    """
+    Split `audio` into consecutive segments of at most `max_segment_s` seconds.
+
+    Cuts are placed in the middle of pauses of at least `min_silence_ms`, as late
+    as possible within each segment; a segment without any pause is cut hard at the
+    maximum length. Returns a list of (start, end) sample indices covering the audio.
+    """
+    max_len = int(max_segment_s * samplerate)
+    if len(audio) <= max_len:
+        return [(0, len(audio))]
+
+    rms = frame_rms(audio, samplerate, frame_ms)
+    frame_len = int(samplerate * frame_ms / 1000)
+    min_frames = max(1, int(min_silence_ms / frame_ms))
+
+    # Candidate cut points: middle of every fully silent window of min_frames
+    silent = (rms < threshold).astype(np.int32)
+    counts = np.convolve(silent, np.ones(min_frames, dtype=np.int32), mode='valid')
+    cuts = np.flatnonzero(counts == min_frames) * frame_len + (min_frames * frame_len) // 2
+
+    bounds = []
+    start = 0
+    while len(audio) - start > max_len:
+        # Last candidate cut inside (start, start + max_len]
+        i = np.searchsorted(cuts, start + max_len, side='right') - 1
+        end = int(cuts[i]) if i >= 0 and cuts[i] > start else start + max_len
+        bounds.append((start, end))
+        start = end
+    bounds.append((start, len(audio)))
+    return bounds
+
+
+def trim_silence(audio: np.ndarray, samplerate: int = 16000, threshold: float = DEFAULT_THRESHOLD,
+                 max_silence_ms: int = 800, padding_ms: int = 200, min_speech_ms: int = 150,
+                 frame_ms: int = FRAME_MS) -> np.ndarray:
+    """
+    Remove non-speech from `audio` before it is sent to the ASR backend.
+
+    Leading and trailing silence is dropped, internal pauses are shortened to at
+    most `max_silence_ms`, and `padding_ms` of context is kept around speech so
+    word onsets and endings are not clipped. The threshold adapts to the noise
+    floor of the recording. Returns an empty array if nothing was said, and the
+    input itself (no copy) if nothing needs to be removed.
+    """
+    rms = frame_rms(audio, samplerate, frame_ms)
+    if len(rms) == 0:
+        return audio[:0]
+
+    speech = rms >= adaptive_threshold(rms, threshold)
+
+    if np.count_nonzero(speech) * frame_ms < min_speech_ms:
+        return audio[:0]
+
+    # Dilate speech frames by the padding on both sides
+    pad = int(padding_ms / frame_ms)
+    if pad > 0:
+        kernel = np.ones(2 * pad + 1, dtype=np.int32)
+        keep = np.convolve(speech.astype(np.int32), kernel, mode='same') > 0
+    else:
+        keep = speech
+
+    # Position of every frame inside its run of dropped frames
+    idx = np.arange(len(keep))
+    run_start = np.maximum.accumulate(np.where(keep, idx + 1, 0))
+    pos_in_run = idx - run_start
+
+    # Internal pauses (speech on both sides) keep up to max_silence_ms
+    speech_before = np.maximum.accumulate(keep)
+    speech_after = np.maximum.accumulate(keep[::-1])[::-1]
+    internal = ~keep & speech_before & speech_after & (pos_in_run < int(max_silence_ms / frame_ms))
+    keep = keep | internal
+
+    if keep.all():
+        return audio
+
+    frame_len = int(samplerate * frame_ms / 1000)
+    mask = np.repeat(keep, frame_len)
+    # Samples after the last whole frame follow that frame's decision
+    if len(mask) < len(audio):
+        mask = np.concatenate([mask, np.full(len(audio) - len(mask), keep[-1])])
+    return audio[mask]
+
+
+def gate(audio: np.ndarray, samplerate: int = 16000) -> np.ndarray:
+    """Apply the configured voice-activity gate (returns audio unchanged when disabled)."""
+    if not settings.get("vad_enabled", True):
+        return audio
+    return trim_silence(audio, samplerate,
+                        threshold=settings.get("silence_threshold", DEFAULT_THRESHOLD),
+                        max_silence_ms=settings.get("vad_max_silence_ms", 800),
+                        padding_ms=settings.get("vad_padding_ms", 200),
+                        min_speech_ms=settings.get("vad_min_speech_ms", 150))
@@ -0,0 +1,176 @@
+"""
+Checks the model download manager against a local HTTP stand-in for the hub.
+
+Serves fake faster-whisper and Parakeet repositories from memory and verifies:
+optional files may be missing, required files may not, interrupted transfers and
+leftover .part files resume with Range requests, and corrupt data is rejected.
+Runs offline: python verify_downloader.py
+"""
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+import downloader
+from downloader import DownloadManager, DownloadError, WHISPER_PATTERNS, WHISPER_REQUIRED
+
+LFS_FILES = {"model.bin", "encoder.int8.onnx"}
+
+# Repos as published: the smaller Whisper models have no preprocessor_config.json
+REPOS = {
+    "Systran/faster-whisper-base": {
+        "config.json": b'{"alignment_heads": []}\n',
+        "model.bin": os.urandom(3_000_000),
+        "tokenizer.json": b'{"model": {}}\n',
+        "vocabulary.txt": b"a\nb\n",
+        "README.md": b"not downloaded\n",
+    },
+    "Systran/faster-whisper-large-v3": {
+        "config.json": b'{"alignment_heads": []}\n',
+        "preprocessor_config.json": b'{"feature_size": 128}\n',
+        "model.bin": os.urandom(1_000_000),
+        "tokenizer.json": b'{"model": {}}\n',
+        "vocabulary.json": b'["a", "b"]\n',
+    },
+    "org/broken": {
+        "config.json": b"{}\n",
+        "tokenizer.json": b"{}\n",
+    },
+    "org/parakeet": {
+        "encoder.int8.onnx": os.urandom(2_000_000),
+        "decoder.int8.onnx": b"decoder",
+        "joiner.int8.onnx": b"joiner",
+        "tokens.txt": b"<blk> 0\n",
+    },
+}
+
+
+class HubStandIn(BaseHTTPRequestHandler):
+    cut_after = None # Drop the first full-file transfer of LFS files after this many bytes
+    range_requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/api/models/"):
+            repo_id = self.path[len("/api/models/"):].split("/revision/")[0]
+            siblings = []
+            for name, data in REPOS[repo_id].items():
+                sibling = {"rfilename": name, "size": len(data)}
+                if name in LFS_FILES:
+                    sibling["lfs"] = {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+                else:
+                    sibling["blobId"] = hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+                siblings.append(sibling)
+            self.reply(200, json.dumps({"sha": "0123abcd", "siblings": siblings}).encode())
+            return
+
+        repo_id, name = self.path.lstrip("/").split("/resolve/")
+        name = name.split("/", 1)[1]
+        data = REPOS[repo_id][name]
+        header = self.headers.get("Range")
+        if header:
+            start = int(header[len("bytes="):-1])
+            self.range_requests.append((name, start))
+            self.reply(206, data[start:])
+        elif self.cut_after and name in LFS_FILES:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data[:self.cut_after])
+            self.close_connection = True
+        else:
+            self.reply(200, data)
+
+    def reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def check(label, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {label}")
+    return condition
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HubStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["HF_ENDPOINT"] = f"http://127.0.0.1:{server.server_address[1]}"
+    work = tempfile.mkdtemp()
+    downloader.HF_CACHE_DIR = os.path.join(work, "hub")
+    passed = True
+
+    try:
+        # Whisper without preprocessor_config.json (tiny/base/small/medium)
+        snapshot = DownloadManager().download_to_hf_cache("Systran/faster-whisper-base", WHISPER_PATTERNS,
+                                                         required=WHISPER_REQUIRED)
+        passed &= check("base model without preprocessor_config.json",
+                        sorted(os.listdir(snapshot)) == ["config.json", "model.bin", "tokenizer.json", "vocabulary.txt"])
+        ref = os.path.join(downloader.HF_CACHE_DIR, "models--Systran--faster-whisper-base", "refs", "main")
+        passed &= check("HF cache refs/main points at the snapshot", open(ref).read() == "0123abcd")
+
+        snapshot = DownloadManager().download_to_hf_cache("Systran/faster-whisper-large-v3", WHISPER_PATTERNS,
+                                                         required=WHISPER_REQUIRED)
+        passed &= check("large-v3 includes preprocessor_config.json",
+                        os.path.exists(os.path.join(snapshot, "preprocessor_config.json")))
+
+        try:
+            DownloadManager().download_to_hf_cache("org/broken", WHISPER_PATTERNS, required=WHISPER_REQUIRED)
+            passed &= check("missing model.bin is an error", False)
+        except DownloadError as e:
+            passed &= check("missing model.bin is an error", "model.bin" in str(e))
+
+        # Parakeet: connection dropped mid-file, retried with a Range request
+        files = list(REPOS["org/parakeet"])
+        dest = os.path.join(work, "parakeet")
+        progress = []
+        HubStandIn.cut_after = 500_000
+        downloader.time.sleep = lambda seconds: None
+        DownloadManager(on_progress=lambda done, total: progress.append((done, total))).download(
+            "org/parakeet", dest, files, required=files)
+        HubStandIn.cut_after = None
+        encoder = os.path.join(dest, "encoder.int8.onnx")
+        total = sum(len(d) for d in REPOS["org/parakeet"].values())
+        passed &= check("interrupted transfer resumed with Range",
+                        ("encoder.int8.onnx", 500_000) in HubStandIn.range_requests
+                        and open(encoder, "rb").read() == REPOS["org/parakeet"]["encoder.int8.onnx"])
+        passed &= check("progress ends at the exact total", progress[-1] == (total, total))
+
+        # Leftover .part from an earlier run
+        os.remove(encoder)
+        with open(encoder + ".part", "wb") as f:
+            f.write(REPOS["org/parakeet"]["encoder.int8.onnx"][:1_200_000])
+        DownloadManager().download("org/parakeet", dest, files, required=files)
+        passed &= check("leftover .part resumed",
+                        ("encoder.int8.onnx", 1_200_000) in HubStandIn.range_requests
+                        and open(encoder, "rb").read() == REPOS["org/parakeet"]["encoder.int8.onnx"])
+
+        # Corrupt .part fails the checksum and is removed
+        os.remove(encoder)
+        with open(encoder + ".part", "wb") as f:
+            f.write(b"\0" * 1_200_000)
+        try:
+            DownloadManager().download("org/parakeet", dest, files, required=files)
+            passed &= check("corrupt data rejected", False)
+        except DownloadError:
+            passed &= check("corrupt data rejected",
+                            not os.path.exists(encoder) and not os.path.exists(encoder + ".part"))
+    finally:
+        server.shutdown()
+        shutil.rmtree(work, ignore_errors=True)
+
+    print("All checks passed." if passed else "Some checks FAILED.")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())